@@ -7,7 +7,10 @@ This script initializes and runs the Discord bot with all its components.
 """
 
 import os
+import queue
+import atexit
 import logging
+import logging.handlers
 import asyncio
 from dotenv import load_dotenv
 import discord
@@ -15,27 +18,39 @@ from discord.ext import commands, tasks
 from discord import app_commands
 import json
 import datetime
+import hashlib
 
 # Import modules
 from modules.twitter_client import TwitterClient
 from modules.ai_summarizer import AISummarizer
 from modules.tweet_formatter import TweetFormatter
-from modules.config import Config
+from modules.config import get_config
 
 # Configure logging
+# Records are queued on the event-loop thread and written to disk by a background listener
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [logging.FileHandler("discord_bot.log"), logging.StreamHandler()]
+for log_handler in log_handlers:
+    log_handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("discord_bot.log"),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+# File storing the hash of the last synced command tree per target, kept next to
+# this script like the other state files so the working directory does not matter
+COMMAND_SYNC_STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".command_sync_state.json")
+
 class TwitterSummaryBot(commands.Bot):
     """Main Discord bot class for Twitter summary functionality."""
     
@@ -44,7 +59,16 @@ class TwitterSummaryBot(commands.Bot):
         super().__init__(command_prefix=None, intents=intents)
         
         # Initialize configuration
-        self.config = Config()
+        self.config = get_config()
+        
+        # 解析測試伺服器 ID，無效或未設定時改為全域同步
+        self._guild_obj = None
+        guild_id = (self.config.discord_guild_id or '').strip()
+        if guild_id:
+            try:
+                self._guild_obj = discord.Object(id=int(guild_id))
+            except ValueError:
+                logger.warning(f"Invalid guild ID: {guild_id}. Syncing commands globally instead.")
         
         # Initialize components
         self.twitter_client = TwitterClient(self.config)
@@ -57,22 +81,52 @@ class TwitterSummaryBot(commands.Bot):
     async def setup_hook(self):
         """Setup hook for registering app commands."""
         # 註冊 slash commands
-        guild_id = self.config.discord_guild_id
-        
-        if guild_id and guild_id.strip():  # 檢查 guild_id 是否存在且不為空白字符串
-            try:
-                guild = discord.Object(id=int(guild_id))
-                self.tree.copy_global_to(guild=guild)
-                await self.tree.sync(guild=guild)
-                logger.info(f"Slash commands synced to test guild: {guild_id}")
-            except ValueError:
-                logger.warning(f"Invalid guild ID: {guild_id}. Syncing commands globally instead.")
-                await self.tree.sync()
-                logger.info("Slash commands synced globally")
-        else:
-            await self.tree.sync()
+        if self._guild_obj:
+            if await self._sync_commands(guild=self._guild_obj):
+                logger.info(f"Slash commands synced to test guild: {self._guild_obj.id}")
+        elif await self._sync_commands():
             logger.info("Slash commands synced globally")
     
+    async def _sync_commands(self, guild=None):
+        """Sync the command tree only if it changed since the last sync.
+        
+        Args:
+            guild: Guild to copy the global commands to and sync, or None to sync globally
+            
+        Returns:
+            True if the commands were synced, False if they were already up to date
+        """
+        target = str(guild.id) if guild else "global"
+        commands_payload = [command.to_dict() for command in self.tree.get_commands()]
+        # Commands are registered per application, so a different bot token must sync again
+        tree_hash = hashlib.sha1(
+            json.dumps([self.application_id, commands_payload], sort_keys=True).encode()
+        ).hexdigest()
+        
+        try:
+            with open(COMMAND_SYNC_STATE_FILE, 'r', encoding='utf-8') as f:
+                sync_state = json.load(f)
+        except (OSError, ValueError):
+            sync_state = {}
+        
+        if sync_state.get(target) == tree_hash:
+            logger.info(f"Slash commands unchanged for {target}, skipping sync")
+            return False
+        
+        if guild:
+            self.tree.copy_global_to(guild=guild)
+        await self.tree.sync(guild=guild)
+        sync_state[target] = tree_hash
+        with open(COMMAND_SYNC_STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(sync_state, f)
+        return True
+    
+    async def close(self):
+        """Release the Twitter client's and AI summarizer's connections before shutting down."""
+        await self.twitter_client.aclose()
+        await self.ai_summarizer.aclose()
+        await super().close()
+    
     async def on_ready(self):
         """Event triggered when the bot is ready and connected to Discord."""
         logger.info(f'Logged in as {self.user.name} ({self.user.id})')
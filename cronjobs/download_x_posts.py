@@ -3,16 +3,19 @@
 測試腳本，用於在本地直接測試 TwitterClient 的功能。
 """
 import asyncio
+import argparse
 import logging
 import sys
 import os
-import json
+import orjson
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from modules.config import Config
+from modules.config import get_config
 from modules.twitter_client import TwitterClient
+from cronjobs.send_webhook import create_http_session, send_message_to_discord
 
 # 設置日誌
 logging.basicConfig(
@@ -22,43 +25,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_MARKDOWN_FILE = "twitter_summary.md"
+
 def save_tweets_to_markdown(tweets_by_user, output_file=None):
     if output_file is None:
-        output_file = f"twitter_summary.md"
+        output_file = DEFAULT_MARKDOWN_FILE
     
     # 同時保存為 JSON 文件
     json_output_file = output_file.replace('.md', '.json')
-    with open(json_output_file, 'w', encoding='utf-8') as json_file:
-        json.dump(tweets_by_user, json_file, ensure_ascii=False, indent=4, default=str)
+    with open(json_output_file, 'wb') as json_file:
+        json_file.write(orjson.dumps(tweets_by_user, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     logger.info(f"已將推文保存到 JSON 文件: {json_output_file}")
     
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(f"# Twitter 摘要報告\n\n")
-        f.write(f"生成時間: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+    # 先在記憶體中組合全部內容，最後一次寫入文件
+    parts = [
+        f"# Twitter 摘要報告\n\n",
+        f"生成時間: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+    ]
+    
+    for username, tweets in tweets_by_user.items():
+        parts.append(f"## 用戶: @{username}\n\n")
+        parts.append(f"共 {len(tweets)} 條推文\n\n")
         
-        for username, tweets in tweets_by_user.items():
-            f.write(f"## 用戶: @{username}\n\n")
-            f.write(f"共 {len(tweets)} 條推文\n\n")
+        for i, tweet in enumerate(tweets, 1):
+            parts.append(f"### 推文 {i}\n\n")
+            # 根據 is_retweet 顯示推文類型
+            tweet_type = "轉推" if tweet['is_retweet'] else "推文"
+            parts.append(f"- **類型**: {tweet_type}\n")
+            if tweet['is_retweet'] and 'original_author' in tweet:
+                parts.append(f"- **原作者**: @{tweet['original_author']}\n")
+            parts.append(f"- **ID**: {tweet['id']}\n")
+            parts.append(f"- **時間**: {tweet['created_at']}\n")
+            parts.append(f"- **內容**: {tweet['text']}\n")
+            parts.append(f"- **鏈接**: {tweet['url']}\n")
+            
+            # 添加圖片
+            if 'image_urls' in tweet and tweet['image_urls']:
+                parts.append(f"\n#### 圖片 ({len(tweet['image_urls'])})\n\n")
+                for j, img_url in enumerate(tweet['image_urls'], 1):
+                    parts.append(f"![圖片 {j}]({img_url})\n\n")
             
-            for i, tweet in enumerate(tweets, 1):
-                f.write(f"### 推文 {i}\n\n")
-                # 根據 is_retweet 顯示推文類型
-                tweet_type = "轉推" if tweet['is_retweet'] else "推文"
-                f.write(f"- **類型**: {tweet_type}\n")
-                if tweet['is_retweet'] and 'original_author' in tweet:
-                    f.write(f"- **原作者**: @{tweet['original_author']}\n")
-                f.write(f"- **ID**: {tweet['id']}\n")
-                f.write(f"- **時間**: {tweet['created_at']}\n")
-                f.write(f"- **內容**: {tweet['text']}\n")
-                f.write(f"- **鏈接**: {tweet['url']}\n")
-                
-                # 添加圖片
-                if 'image_urls' in tweet and tweet['image_urls']:
-                    f.write(f"\n#### 圖片 ({len(tweet['image_urls'])})\n\n")
-                    for j, img_url in enumerate(tweet['image_urls'], 1):
-                        f.write(f"![圖片 {j}]({img_url})\n\n")
-                
-                f.write("\n---\n\n")
+            parts.append("\n---\n\n")
+    
+    Path(output_file).write_text("".join(parts), encoding="utf-8")
     
     logger.info(f"已將推文保存到 Markdown 文件: {output_file}")
     return output_file
@@ -97,23 +106,44 @@ async def test_get_recent_tweets(client, username=None, hours=24, save_md=True):
             logger.info(f"獲取到 {username} 的 {len(tweets)} 條推文")
     # 保存為 Markdown 文件
     if save_md and filtered_tweets:
-        save_tweets_to_markdown(filtered_tweets)
+        # 在執行緒中寫入文件，避免阻塞事件循環
+        await asyncio.to_thread(save_tweets_to_markdown, filtered_tweets)
     
     return tweets_by_user
 
+async def run_pipeline(config, hours=24, send_discord=False):
+    """抓取推文並保存，需要時將資料發送到 Discord。
+    
+    整個流程共用同一個 HTTP session，讓後續請求重複使用已建立的連線。
+    """
+    async with create_http_session() as session:
+        # 創建 TwitterClient 實例，抓取推文時也使用同一個 session；結束時關閉瀏覽器與緩存資料庫
+        async with TwitterClient(config, session=session) as client:
+            await test_get_recent_tweets(client, config.twitter_users, hours)
+        
+        if send_discord and config.discord_channel_id:
+            await send_message_to_discord(
+                config.discord_token,
+                config.discord_channel_id,
+                json_path=DEFAULT_MARKDOWN_FILE.replace('.md', '.json'),
+                md_path=DEFAULT_MARKDOWN_FILE,
+                hours=hours,
+                session=session
+            )
+
 async def main():
     """主函數"""
+    parser = argparse.ArgumentParser(description='下載最近的推文並保存為 JSON 與 Markdown')
+    parser.add_argument('--hours', type=int, default=24, help='抓取過去幾小時的推文')
+    parser.add_argument('--send_discord', action='store_true', help='將結果發送到 Discord')
+    args = parser.parse_args()
+    
     # 加載環境變量
     load_dotenv()
     
     # 創建配置對象
-    config = Config()
-    
-    # 創建 TwitterClient 實例
-    client = TwitterClient(config)
-    hours = 24
-    username = config.twitter_users
-    await test_get_recent_tweets(client, username, hours)
+    config = get_config()
+    await run_pipeline(config, args.hours, args.send_discord)
 
 
 if __name__ == "__main__":
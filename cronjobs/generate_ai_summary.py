@@ -6,17 +6,20 @@ This script reads the Twitter JSON data and uses the AI Summarizer to generate a
 
 import asyncio
 import argparse
+import functools
+import itertools
 import logging
 import os
+import re
 import sys
-import json
+import orjson
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Add the parent directory to sys.path to import modules
 sys.path.append(str(Path(__file__).parent.parent))
 
-from modules.config import Config
+from modules.config import get_config
 from modules.ai_summarizer import AISummarizer
 
 # Configure logging
@@ -26,6 +29,133 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 所有摘要 embed 共用的欄位
+EMBED_TEMPLATE = {"color": 5814783}  # 紫色
+# 只匹配行首的 ####，避免誤切內容中的 ####
+SECTION_HEADER_RE = re.compile(r'^####\s*', re.M)
+TITLE_MARKUP_RE = re.compile(r'^\*+|\*+$')
+
+def iter_embeds(summary, hours, twitter_users_text):
+    """依照 #### 小標題將 AI 摘要逐段轉換為 Discord embed。
+    
+    Args:
+        summary: AI 生成的摘要文字
+        hours: 摘要涵蓋的小時數
+        twitter_users_text: 顯示在總體摘要 footer 的追蹤用戶
+        
+    Yields:
+        Discord embed dictionaries
+    """
+    headers = SECTION_HEADER_RE.finditer(summary)
+    first = next(headers, None)
+    if first is None:
+        return
+    
+    # 總體摘要部分 (第一個小標題之前的內容)
+    main_summary = summary[:first.start()].strip()
+    if main_summary:
+        yield {
+            **EMBED_TEMPLATE,
+            "title": f"過去 {hours} 小時推特摘要報告（Hololive 卡牌遊戲相關）",
+            "description": main_summary,
+            "footer": {
+                "text": f"追蹤用戶: {twitter_users_text}"
+            }
+        }
+    
+    # 各個子標題部分
+    start = first.end()
+    for header in itertools.chain(headers, [None]):
+        end = header.start() if header else len(summary)
+        section = summary[start:end].strip()
+        if header:
+            start = header.end()
+        if not section:
+            continue
+        
+        # 分離標題和內容
+        title, _, content = section.partition("\n")
+        yield {
+            **EMBED_TEMPLATE,
+            "title": TITLE_MARKUP_RE.sub('', title.strip()).strip(),
+            "description": content.strip()
+        }
+
+@functools.lru_cache(maxsize=1)
+def get_summarizer():
+    """Return the shared AI summarizer, creating it on first use."""
+    return AISummarizer(get_config())
+
+async def send_summary_to_discord(config, summary, tweets_data, hours):
+    """Send the AI summary and the original tweet links to Discord.
+    
+    All messages share one HTTP session so they reuse the same connection.
+    
+    Args:
+        config: Configuration object containing the Discord token and channel
+        summary: Generated summary text
+        tweets_data: Dictionary mapping usernames to lists of their tweets
+        hours: Number of hours the data covers
+    """
+    from cronjobs.send_webhook import create_http_session, send_message_to_discord
+    from datetime import datetime
+    
+    async with create_http_session() as session:
+        # 取得今天的日期
+        today = datetime.now().strftime("%m/%d")
+        
+        # 從 JSON 資料中獲取 Twitter 用戶名
+        twitter_users_text = ", ".join([f"@{user}" for user in tweets_data.keys()]) if tweets_data else "無監控用戶"
+        
+        # 創建主要內容
+        # 注意：Discord 的 embed 描述有字數限制，所以將摘要的每個段落作為單獨的 embed
+        message = {
+            "content": f"### **{today} 過去 {hours} 小時推特內容摘要報告**",
+            "embeds": list(iter_embeds(summary, hours, twitter_users_text))
+        }
+        
+        # 發送訊息
+        logger.info("Sending AI summary to Discord...")
+        await send_message_to_discord(
+            token=config.discord_token,
+            channel_id=config.discord_channel_id,
+            message_data=message,
+            session=session
+        )
+        logger.info("AI summary sent to Discord successfully")
+        
+        # 發送原始推文連結
+        links_parts = ["**原始推文連結：**\n"]
+        links_length = len(links_parts[0])
+        for username, tweets in tweets_data.items():
+            links_content = "".join([f"**User: {username}**\n", *(f"{tweet['url']}\n" for tweet in tweets), "\n"])
+            
+            # 檢查訊息長度，Discord 有 2000 字元的限制
+            if links_length + len(links_content) > 1900:  # 留一些餘量
+                # 發送當前訊息並創建新的
+                await send_message_to_discord(
+                    token=config.discord_token,
+                    channel_id=config.discord_channel_id,
+                    message_data={"content": "".join(links_parts)},
+                    session=session
+                )
+                links_parts = []
+                links_length = 0
+            
+            links_parts.append(links_content)
+            links_length += len(links_content)
+        
+        # 發送最後的連結訊息（如果有內容）
+        links_message = {"content": "".join(links_parts)}
+        if links_message["content"].strip():
+            await send_message_to_discord(
+                token=config.discord_token,
+                channel_id=config.discord_channel_id,
+                message_data=links_message,
+                session=session
+            )
+            logger.info("Tweet links sent to Discord successfully")
+
 async def main():
     """Main function to generate AI summaries from Twitter data."""
     parser = argparse.ArgumentParser(description='Generate AI summaries from Twitter data')
@@ -39,8 +169,8 @@ async def main():
     load_dotenv()
     
     # Initialize config and AI summarizer
-    config = Config()
-    summarizer = AISummarizer(config)
+    summarizer = get_summarizer()
+    config = summarizer.config
     
     # Ensure the JSON file exists
     json_path = args.json
@@ -52,9 +182,15 @@ async def main():
         return 1
     
     try:
+        # Read the JSON once and reuse it for the summary and the Discord message,
+        # warming up the DeepSeek connection in the background meanwhile
+        summarizer.start_warmup()
+        tweets_bytes = await asyncio.to_thread(Path(json_path).read_bytes)
+        tweets_data = orjson.loads(tweets_bytes)
+        
         # Generate summary from JSON
         logger.info(f"Generating AI summary from {json_path}...")
-        summary = await summarizer.generate_summary_from_json(json_path, args.hours)
+        summary = await summarizer.generate_summary_from_dict(tweets_data, args.hours)
         
         # Save summary to file
         output_path = args.output
@@ -69,97 +205,7 @@ async def main():
         
         # Send to Discord if requested
         if args.send_discord and config.discord_channel_id:
-            from cronjobs.send_webhook import send_message_to_discord
-            from datetime import datetime
-            
-            # 取得今天的日期
-            today = datetime.now().strftime("%m/%d")
-            
-            # 從 JSON 文件中獲取 Twitter 用戶名
-            with open(json_path, 'r', encoding='utf-8') as f:
-                tweets_data = json.load(f)
-                twitter_users_text = ", ".join([f"@{user}" for user in tweets_data.keys()]) if tweets_data else "無監控用戶"
-            
-            # 創建主要內容
-            message = {
-                "content": f"### **{today} 過去 {args.hours} 小時推特內容摘要報告**",
-                "embeds": []
-            }
-            
-            # 將 AI 生成的摘要格式化為 Discord 訊息
-            # 注意：Discord 的 embed 描述有字數限制，所以我們將長文本分成多個 embed
-            
-            # 分段處理摘要，每個主要段落作為一個單獨的 embed
-            # 這樣可以避免超過 Discord 的字數限制，並且提高可讀性
-            sections = summary.split("####")
-            
-            # 處理總體摘要部分 (如果存在)
-            if len(sections) > 1:
-                main_summary = sections[0].strip()
-                if main_summary:
-                    message["embeds"].append({
-                        "title": f"過去 {args.hours} 小時推特摘要報告（Hololive 卡牌遊戲相關）",
-                        "description": main_summary,
-                        "color": 5814783,  # 紫色
-                        "footer": {
-                            "text": f"追蹤用戶: {twitter_users_text}"
-                        }
-                    })
-            
-            # 處理各個子標題部分
-            for i, section in enumerate(sections[1:], 1):
-                if not section.strip():
-                    continue
-                    
-                # 分離標題和內容
-                lines = section.strip().split("\n")
-                title = lines[0].strip().strip("*").strip()
-                content = "\n".join(lines[1:]).strip()
-                
-                # 添加為 embed
-                message["embeds"].append({
-                    "title": title,
-                    "description": content,
-                    "color": 5814783  # 紫色
-                })
-            
-            # 發送訊息
-            logger.info("Sending AI summary to Discord...")
-            send_message_to_discord(
-                token=config.discord_token,
-                channel_id=config.discord_channel_id,
-                message_data=message
-            )
-            logger.info("AI summary sent to Discord successfully")
-            
-            # 發送原始推文連結
-            links_message = {"content": "**原始推文連結：**\n"}
-            for username, tweets in tweets_data.items():
-                links_content = f"**User: {username}**\n"
-                for tweet in tweets:
-                    links_content += f"{tweet['url']}\n"
-                links_content += "\n"
-                
-                # 檢查訊息長度，Discord 有 2000 字元的限制
-                if len(links_message["content"] + links_content) > 1900:  # 留一些餘量
-                    # 發送當前訊息並創建新的
-                    send_message_to_discord(
-                        token=config.discord_token,
-                        channel_id=config.discord_channel_id,
-                        message_data=links_message
-                    )
-                    links_message = {"content": ""}
-                
-                links_message["content"] += links_content
-            
-            # 發送最後的連結訊息（如果有內容）
-            if links_message["content"].strip():
-                send_message_to_discord(
-                    token=config.discord_token,
-                    channel_id=config.discord_channel_id,
-                    message_data=links_message
-                )
-                logger.info("Tweet links sent to Discord successfully")
+            await send_summary_to_discord(config, summary, tweets_data, args.hours)
         
         return 0
     
@@ -1,12 +1,17 @@
 #!/usr/bin/env python
 """
-腳本用於手動登入 Twitter 並保存 cookies 到文件。
+腳本用於登入 Twitter 並保存 cookies 到文件。
+預設使用瀏覽器登入；加上 --http 則直接透過 HTTP 執行 Twitter 的登入流程（實驗性）。
 """
 
 import os
+import re
 import json
 import time
-import pickle
+import shutil
+import argparse
+import subprocess
+import httpx
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -20,6 +25,162 @@ from dotenv import load_dotenv
 # 加載環境變量
 load_dotenv()
 
+# Twitter 網頁版使用的公開 Bearer Token
+TWITTER_WEB_BEARER_TOKEN = "AAAAAAAAAAAAAAAAAAAAANRILgAAAAAAnNwIzUejRCOuH5E6I8xnZz4puTs%3D1Zv7ttfk8LF81IUq16cHjhLTvJu4FA33AGWWjCpTnA"
+# 使用 x.com 的 API 網域，讓取得的 cookies 與 twitter.com 跳轉後的 x.com 網域一致
+GUEST_ACTIVATE_URL = "https://api.x.com/1.1/guest/activate.json"
+LOGIN_FLOW_URL = "https://api.x.com/1.1/onboarding/task.json"
+COOKIE_DOMAIN = ".x.com"
+# 快取 ChromeDriver 路徑的文件，避免每次都透過 webdriver_manager 連網檢查版本
+CHROMEDRIVER_PATH_CACHE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.chromedriver_path')
+CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser')
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36"
+
+def login_twitter_http(email, password, username):
+    """直接透過 Twitter 的 onboarding API 登入並返回 cookies。
+    
+    Args:
+        email: 登入用的電子郵件
+        password: 登入密碼
+        username: Twitter 要求確認身份時使用的用戶名
+        
+    Returns:
+        List of cookie dictionaries or None if login failed
+    """
+    # 每個子任務對應的回應內容
+    subtask_inputs = {
+        "LoginJsInstrumentationSubtask": lambda: {
+            "js_instrumentation": {"response": "{}", "link": "next_link"}
+        },
+        "LoginEnterUserIdentifierSSO": lambda: {
+            "settings_list": {
+                "setting_responses": [
+                    {"key": "user_identifier", "response_data": {"text_data": {"result": email}}}
+                ],
+                "link": "next_link"
+            }
+        },
+        "LoginEnterAlternateIdentifierSubtask": lambda: {
+            "enter_text": {"text": username, "link": "next_link"}
+        },
+        "LoginEnterPassword": lambda: {
+            "enter_password": {"password": password, "link": "next_link"}
+        },
+        "AccountDuplicationCheck": lambda: {
+            "check_logged_in_account": {"link": "AccountDuplicationCheck_false"}
+        },
+    }
+    
+    headers = {
+        "Authorization": f"Bearer {TWITTER_WEB_BEARER_TOKEN}",
+        "User-Agent": USER_AGENT,
+        "X-Twitter-Active-User": "yes",
+        "X-Twitter-Client-Language": "en",
+    }
+    
+    try:
+        print("嘗試透過 HTTP 登入 Twitter...")
+        with httpx.Client(headers=headers, timeout=30, follow_redirects=True) as client:
+            # 取得 guest token
+            response = client.post(GUEST_ACTIVATE_URL)
+            response.raise_for_status()
+            client.headers["X-Guest-Token"] = response.json()["guest_token"]
+            
+            # 開始登入流程
+            response = client.post(LOGIN_FLOW_URL, params={"flow_name": "login"}, json={
+                "input_flow_data": {
+                    "flow_context": {"debug_overrides": {}, "start_location": {"location": "splash_screen"}}
+                },
+                "subtask_versions": {}
+            })
+            response.raise_for_status()
+            flow = response.json()
+            
+            # 依序完成 Twitter 要求的子任務，flow_token 與 att cookie 會在每一步傳遞下去
+            while flow.get("subtasks"):
+                subtask_id = flow["subtasks"][0]["subtask_id"]
+                if subtask_id == "LoginSuccessSubtask":
+                    break
+                if subtask_id not in subtask_inputs:
+                    print(f"登入流程需要未支援的步驟: {subtask_id}，請改用瀏覽器登入（不加 --http）")
+                    return None
+                
+                print(f"處理登入步驟: {subtask_id}")
+                response = client.post(LOGIN_FLOW_URL, json={
+                    "flow_token": flow["flow_token"],
+                    "subtask_inputs": [{"subtask_id": subtask_id, **subtask_inputs[subtask_id]()}]
+                })
+                response.raise_for_status()
+                flow = response.json()
+            
+            # 爬蟲在 twitter.com 跳轉到 x.com 之後才加入 cookies，網域不符的 cookie 會被瀏覽器拒絕，
+            # 因此把 twitter.com 網域的 cookie 一律改寫為 x.com
+            cookies = [
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": COOKIE_DOMAIN if cookie.domain.lstrip(".").endswith("twitter.com") else cookie.domain,
+                    "path": cookie.path,
+                    "secure": cookie.secure,
+                }
+                for cookie in client.cookies.jar
+            ]
+        
+        if not any(cookie["name"] == "auth_token" for cookie in cookies):
+            print("登入失敗: 未取得 auth_token")
+            return None
+        
+        print("成功登入 Twitter!")
+        print(f"獲取到 {len(cookies)} 個 cookies")
+        return cookies
+    
+    except Exception as e:
+        print(f"HTTP 登入過程中出現錯誤: {str(e)}")
+        return None
+
+def _major_version(executable):
+    """執行 `executable --version` 並返回主版本號，失敗時返回 None。"""
+    try:
+        output = subprocess.check_output([executable, '--version'], text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r'(\d+)\.\d+', output)
+    return match.group(1) if match else None
+
+def get_chromedriver_path():
+    """返回與已安裝 Chrome 主版本相符的 ChromeDriver 路徑。
+    
+    設定了 CHROMEDRIVER_PATH 時直接使用該路徑；否則優先使用快取的路徑，
+    只有在快取不存在或版本不符時才透過 webdriver_manager 重新取得。
+    """
+    env_path = os.getenv('CHROMEDRIVER_PATH')
+    if env_path:
+        return env_path
+    
+    chrome_version = None
+    for binary in CHROME_BINARIES:
+        chrome_path = shutil.which(binary)
+        if chrome_path:
+            chrome_version = _major_version(chrome_path)
+            break
+    
+    try:
+        with open(CHROMEDRIVER_PATH_CACHE, 'r', encoding='utf-8') as f:
+            cached_path = f.read().strip()
+    except OSError:
+        cached_path = None
+    
+    if cached_path and os.path.exists(cached_path) and chrome_version and _major_version(cached_path) == chrome_version:
+        return cached_path
+    
+    driver_path = ChromeDriverManager().install()
+    try:
+        with open(CHROMEDRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+            f.write(driver_path)
+    except OSError as e:
+        print(f"無法保存 ChromeDriver 路徑快取: {str(e)}")
+    return driver_path
+
 def setup_driver():
     """設置並返回配置好的 Chrome WebDriver。"""
     chrome_options = Options()
@@ -29,7 +190,7 @@ def setup_driver():
     chrome_options.add_argument("--window-size=1920,1080")
     chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36")
     
-    service = Service(ChromeDriverManager().install())
+    service = Service(get_chromedriver_path())
     driver = webdriver.Chrome(service=service, options=chrome_options)
     driver.set_page_load_timeout(30)
     return driver
@@ -67,8 +228,7 @@ def login_twitter(driver):
             username_field = WebDriverWait(driver, 5).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "input[data-testid='ocfEnterTextTextInput']"))
             )
-            # 如果需要，請在這裡手動輸入您的 Twitter 用戶名
-            username = 'a_kuafen'  # 替換為您的 Twitter 用戶名
+            username = os.getenv('TWITTER_USERNAME', 'a_kuafen')
             print(f"輸入用戶名: {username}")
             username_field.send_keys(username)
             username_field.send_keys(Keys.ENTER)
@@ -110,22 +270,20 @@ def login_twitter(driver):
         print(f"登入過程中出現錯誤: {str(e)}")
         return None
 
-def save_cookies(cookies, filename='twitter_cookies.pkl'):
-    """保存 cookies 到文件。"""
+def save_cookies(cookies, filename='twitter_cookies.json'):
+    """保存 cookies 到 JSON 文件。
+    
+    Cookies 只包含名稱、值、網域等純資料，以 JSON 保存即可，不使用 pickle。
+    """
     if not cookies:
         print("沒有 cookies 可保存")
         return False
     
     try:
-        # 保存為 pickle 格式
-        with open(filename, 'wb') as f:
-            pickle.dump(cookies, f)
-        
-        # 同時保存為 JSON 格式以便查看
-        with open(f"{filename}.json", 'w', encoding='utf-8') as f:
+        with open(filename, 'w', encoding='utf-8') as f:
             json.dump(cookies, f, indent=4)
         
-        print(f"Cookies 已保存到 {filename} 和 {filename}.json")
+        print(f"Cookies 已保存到 {filename}")
         return True
     except Exception as e:
         print(f"保存 cookies 時出現錯誤: {str(e)}")
@@ -133,18 +291,31 @@ def save_cookies(cookies, filename='twitter_cookies.pkl'):
 
 def main():
     """主函數。"""
-    driver = None
-    try:
-        driver = setup_driver()
-        cookies = login_twitter(driver)
-        if cookies:
-            save_cookies(cookies)
-            print("請手動檢查您是否已成功登入 Twitter。如果登入成功，cookies 已被保存。")
-        else:
-            print("獲取 cookies 失敗")
-    finally:
-        if driver:
-            driver.quit()
+    parser = argparse.ArgumentParser(description='登入 Twitter 並保存 cookies')
+    parser.add_argument('--http', action='store_true', help='直接透過 HTTP 登入，不開啟瀏覽器（實驗性，尚未經過完整驗證）')
+    args = parser.parse_args()
+    
+    if args.http:
+        email = os.getenv('TWITTER_EMAIL')
+        password = os.getenv('TWITTER_PASSWORD')
+        if not email or not password:
+            print("錯誤: 環境變量中未設置 TWITTER_EMAIL 或 TWITTER_PASSWORD")
+            return
+        cookies = login_twitter_http(email, password, os.getenv('TWITTER_USERNAME', 'a_kuafen'))
+    else:
+        driver = None
+        try:
+            driver = setup_driver()
+            cookies = login_twitter(driver)
+        finally:
+            if driver:
+                driver.quit()
+    
+    if cookies:
+        save_cookies(cookies)
+        print("請手動檢查您是否已成功登入 Twitter。如果登入成功，cookies 已被保存。")
+    else:
+        print("獲取 cookies 失敗")
 
 if __name__ == "__main__":
     main()
@@ -4,12 +4,14 @@
 這個腳本可以在 test_twitter_client.py 生成文件後被調用。
 """
 import os
-import json
+import orjson
 import argparse
 import logging
-import requests
+import asyncio
+import aiohttp
 import base64
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 
 # 設置日誌
@@ -20,7 +22,65 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def send_message_to_discord(token, channel_id, message_data=None, json_path=None, md_path=None, hours=24):
+DISCORD_API_BASE = "https://discord.com/api/v10"
+# 連線池中保留的最大連線數
+MAX_POOLED_CONNECTIONS = 10
+# Discord 單一路由約每秒 5 個請求，同時發送的請求數不超過此值
+MAX_CONCURRENT_REQUESTS = 5
+# 遇到 429 時最多重試的次數
+MAX_RATE_LIMIT_RETRIES = 3
+# session 預設的請求逾時，避免卡住的連線讓整個流程等待 aiohttp 預設的 300 秒
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=60)
+# 截斷推文文字時使用的省略符號
+ELLIPSIS = '...'
+# 推文使用 Twitter 藍色，轉推使用橙色
+TWEET_COLOR = 1942002
+RT_COLOR = 15844367
+# 推文與轉推 embed 共用的固定欄位
+TWEET_EMBED = {"color": TWEET_COLOR}
+RETWEET_EMBED = {"color": RT_COLOR}
+RETWEET_AUTHOR_ICON_URL = "https://abs.twimg.com/responsive-web/client-web/icon-default.522d363a.png"
+
+async def _post_with_retry(session, semaphore, api_url, headers, make_data):
+    """發送單一請求到 Discord，依照速率限制標頭退避，失敗時拋出例外。
+    
+    Args:
+        make_data: 每次嘗試時呼叫以取得請求內容；FormData 只能送出一次，重試時必須重新建立
+    """
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        async with semaphore:
+            async with session.post(api_url, headers=headers, data=make_data()) as response:
+                if response.status == 429 and attempt < MAX_RATE_LIMIT_RETRIES:
+                    retry_after = float(response.headers.get('Retry-After', 1))
+                    logger.warning(f"觸發 Discord 速率限制，{retry_after} 秒後重試")
+                    await asyncio.sleep(retry_after)
+                    continue
+                response.raise_for_status()
+                
+                # 額度用盡時，在釋放 semaphore 前等待額度重置
+                if response.headers.get('X-RateLimit-Remaining') == '0':
+                    await asyncio.sleep(float(response.headers.get('X-RateLimit-Reset-After', 0)))
+                return
+
+async def _post_message(session, semaphore, api_url, headers, payload):
+    """發送單一 JSON 訊息到 Discord，依照速率限制標頭退避，失敗時拋出例外。"""
+    # 只序列化一次，重試時沿用同一份內容
+    body = orjson.dumps(payload)
+    await _post_with_retry(session, semaphore, api_url, headers, lambda: body)
+
+def create_http_session():
+    """建立同一次執行中所有 HTTP 請求共用的 session 與連線池。
+    
+    session 不帶任何認證標頭，Discord 的 Bot Token 在每個請求中個別傳入，
+    因此同一個 session 也可以安全地用於其他服務的請求。
+    
+    Returns:
+        aiohttp.ClientSession: 呼叫者負責關閉的 session
+    """
+    connector = aiohttp.TCPConnector(limit=MAX_POOLED_CONNECTIONS, keepalive_timeout=60)
+    return aiohttp.ClientSession(connector=connector, timeout=REQUEST_TIMEOUT)
+
+async def send_message_to_discord(token, channel_id, message_data=None, json_path=None, md_path=None, hours=24, session=None):
     """
     通過 Discord API 發送訊息或 Twitter 資料。
     
@@ -31,24 +91,28 @@ def send_message_to_discord(token, channel_id, message_data=None, json_path=None
         json_path: JSON 文件路徑 (可選，如果提供 message_data 則忽略)
         md_path: Markdown 文件路徑 (可選，如果提供 message_data 則忽略)
         hours: 資料涵蓋的小時數 (僅用於 Twitter 資料)
+        session: 共用的 HTTP session (可選，未提供則建立並在結束時關閉)
         
     Returns:
         bool: 是否成功發送
     """
+    # 所有請求共用同一個 session，重複使用同一條 TCP/TLS 連線
+    owns_session = session is None
+    if owns_session:
+        session = create_http_session()
+    
     try:
         # 設置 API URL
-        api_url = f"https://discord.com/api/v10/channels/{channel_id}/messages"
+        api_url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages"
+        headers = {'Authorization': f'Bot {token}'}
+        json_headers = {**headers, 'Content-Type': 'application/json'}
         
-        # 設置 headers
-        headers = {
-            'Authorization': f'Bot {token}',
-            'Content-Type': 'application/json'
-        }
+        # 限制同時發送的請求數
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
         
         # 如果提供了 message_data，直接發送
         if message_data:
-            response = requests.post(api_url, headers=headers, json=message_data)
-            response.raise_for_status()
+            await _post_message(session, semaphore, api_url, json_headers, message_data)
             logger.info(f"成功發送訊息到 Discord")
             return True
         
@@ -66,9 +130,9 @@ def send_message_to_discord(token, channel_id, message_data=None, json_path=None
             logger.error(f"Markdown 文件不存在: {md_path}")
             return False
         
-        # 讀取 JSON 文件
-        with open(json_path, 'r', encoding='utf-8') as f:
-            tweets_data = json.load(f)
+        # 在執行緒中讀取 JSON 文件，避免阻塞事件循環；讀取結果同時用於上傳附件
+        json_payload = await asyncio.to_thread(Path(json_path).read_bytes)
+        tweets_data = orjson.loads(json_payload)
         
         # 創建一個摘要消息
         summary_message = {
@@ -77,7 +141,7 @@ def send_message_to_discord(token, channel_id, message_data=None, json_path=None
                 {
                     "title": "Twitter 摘要報告",
                     "description": f"生成時間: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                    "color": 1942002,  # Twitter 藍色
+                    "color": TWEET_COLOR,
                     "fields": []
                 }
             ]
@@ -92,11 +156,11 @@ def send_message_to_discord(token, channel_id, message_data=None, json_path=None
             })
         
         # 發送摘要消息
-        response = requests.post(api_url, headers=headers, json=summary_message)
-        response.raise_for_status()
+        await _post_message(session, semaphore, api_url, json_headers, summary_message)
         logger.info(f"成功發送摘要消息到 Discord")
         
         # 為每個用戶創建一個聚合消息
+        user_messages = []
         for username, tweets in tweets_data.items():
             # 只處理最近的 5 條推文，避免超過 Discord 的 embed 限制
             recent_tweets = tweets[:5]
@@ -111,39 +175,43 @@ def send_message_to_discord(token, channel_id, message_data=None, json_path=None
             
             # 添加每條推文作為單獨的 embed
             for tweet in recent_tweets:
-                tweet_type = "轉推" if tweet.get('is_retweet', False) else "推文"
+                text = tweet['text']
+                text_length = len(text)
+                url = tweet['url']
+                is_retweet = tweet.get('is_retweet', False)
+                tweet_type = "轉推" if is_retweet else "推文"
                 
                 # 創建 embed
-                embed = {
-                    "title": f"{tweet_type}: {tweet['text'][:100] + ('...' if len(tweet['text']) > 100 else '')}",
-                    "description": tweet['text'] if len(tweet['text']) <= 500 else tweet['text'][:497] + '...',
-                    "url": tweet['url'],
-                    "color": 1942002 if not tweet.get('is_retweet', False) else 15844367,  # 藍色或橙色
+                embed = (RETWEET_EMBED if is_retweet else TWEET_EMBED) | {
+                    "title": f"{tweet_type}: {text[:100] + ELLIPSIS if text_length > 100 else text}",
+                    "description": text if text_length <= 500 else text[:497] + ELLIPSIS,
+                    "url": url,
                     "footer": {
                         "text": f"🕒 {tweet['created_at']} | Tweet ID: {tweet['id']}"
                     }
                 }
                 
                 # 如果是轉推，添加原作者信息
-                if tweet.get('is_retweet', False) and 'original_author' in tweet:
+                if is_retweet and 'original_author' in tweet:
                     embed["author"] = {
                         "name": f"原作者: @{tweet['original_author']}",
-                        "icon_url": "https://abs.twimg.com/responsive-web/client-web/icon-default.522d363a.png"
+                        "icon_url": RETWEET_AUTHOR_ICON_URL
                     }
                 
                 # 如果有圖片，添加到 embed
-                if 'image_urls' in tweet and tweet['image_urls']:
+                image_urls = tweet.get('image_urls')
+                if image_urls:
                     embed["image"] = {
-                        "url": tweet['image_urls'][0]
+                        "url": image_urls[0]
                     }
                     
                     # 添加 embed 到消息
                     user_message["embeds"].append(embed)
                     
                     # 如果有多張圖片，為每張額外的圖片創建新的 embed
-                    for img_url in tweet['image_urls'][1:]:
+                    for img_url in image_urls[1:]:
                         img_embed = {
-                            "url": tweet['url'],
+                            "url": url,
                             "image": {
                                 "url": img_url
                             }
@@ -153,28 +221,27 @@ def send_message_to_discord(token, channel_id, message_data=None, json_path=None
                     # 沒有圖片的推文，直接添加 embed
                     user_message["embeds"].append(embed)
             
-            # 發送用戶推文聚合消息
-            response = requests.post(api_url, headers=headers, json=user_message)
-            response.raise_for_status()
+            user_messages.append((username, user_message))
+        
+        # 同時發送所有用戶推文聚合消息
+        await asyncio.gather(*[
+            _post_message(session, semaphore, api_url, json_headers, user_message)
+            for _, user_message in user_messages
+        ])
+        for username, _ in user_messages:
             logger.info(f"成功發送 @{username} 的推文聚合消息到 Discord")
         
         # 上傳 JSON 文件作為附件
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        files = {
-            'file': (f"twitter_data_{timestamp}.json", open(json_path, 'rb'))
-        }
-        
-        file_message = {
-            'content': f"過去 {hours} 小時的 Twitter 資料 (JSON 格式)"
-        }
         
-        # 發送文件需要不同的 headers
-        file_headers = {
-            'Authorization': f'Bot {token}'
-        }
+        def build_form():
+            form = aiohttp.FormData()
+            form.add_field('content', f"過去 {hours} 小時的 Twitter 資料 (JSON 格式)")
+            form.add_field('file', json_payload, filename=f"twitter_data_{timestamp}.json", content_type='application/json')
+            return form
         
-        response = requests.post(api_url, headers=file_headers, data=file_message, files=files)
-        response.raise_for_status()
+        # 與其他訊息一樣經過 semaphore 與 429 重試
+        await _post_with_retry(session, semaphore, api_url, headers, build_form)
         logger.info(f"成功發送 JSON 文件到 Discord")
         
         return True
@@ -182,6 +249,9 @@ def send_message_to_discord(token, channel_id, message_data=None, json_path=None
     except Exception as e:
         logger.error(f"發送消息到 Discord 時出錯: {str(e)}")
         return False
+    finally:
+        if owns_session:
+            await session.close()
 
 def main():
     """主函數，處理命令行參數並調用發送函數。"""
@@ -210,7 +280,7 @@ def main():
         return False
     
     # 發送消息
-    return send_message_to_discord(token, channel_id, json_path=args.json, md_path=args.md, hours=args.hours)
+    return asyncio.run(send_message_to_discord(token, channel_id, json_path=args.json, md_path=args.md, hours=args.hours))
 
 if __name__ == "__main__":
     main()
@@ -5,15 +5,44 @@ Supports DeepSeek API integration.
 
 import logging
 import asyncio
-import json
+import hashlib
 import os
-from typing import Dict, List, Any
-from openai import OpenAI
-from modules.config import Config
-import concurrent.futures
+from pathlib import Path
+from typing import Dict, List, Any, Set, Tuple, AsyncIterator
+import httpx
+import orjson
+from openai import AsyncOpenAI
+from modules.config import Config, get_config
 
 logger = logging.getLogger(__name__)
 
+# 批次生成摘要時同時進行的 DeepSeek 請求上限
+MAX_CONCURRENT_SUMMARIES = 10
+
+# 每個 AISummarizer 最多快取的摘要數量
+MAX_CACHED_SUMMARIES = 32
+
+# 送給 DeepSeek 的推文內容 token 上限，超過時會先捨棄轉推與較舊的推文
+MAX_INPUT_TOKENS = 30_000
+
+# 送出摘要請求前最多等待背景暖機連線的秒數，超過就直接送出
+WARMUP_WAIT_TIMEOUT = 2.0
+
+# DeepSeek 摘要使用的提示詞，只在模組載入時建立一次
+SYSTEM_PROMPT = "你是一個專業的推特內容摘要助手。你的任務是分析並總結過去時間內的所有推文，提供一個全面且條理清晰的摘要。"
+
+USER_PROMPT_TEMPLATE = """請根據以下過去 {hours} 小時的推特數據，生成一份全面的摘要報告：
+
+{tweets_payload}
+
+要求：
+1. 對過去 {hours} 小時所有用戶發文加總起來做一個總體摘要
+2. 以條列式列出重要資訊和趨勢
+3. 必須使用繁體中文回覆
+4. 注意識別轉推與原創推文的區別
+5. 重點關注與卡牌遊戲、Hololive 相關的內容
+"""
+
 class AISummarizer:
     """AI-powered summarizer for generating summaries of tweets."""
     
@@ -25,18 +54,67 @@ class AISummarizer:
         """
         self.config = config
         self.client = None
+        # 以推文內容、時數與模型的雜湊為鍵的摘要快取
+        self._summary_cache: Dict[str, str] = {}
+        self._warmup_task = None
         self._initialize_client()
-        # 創建執行緒池
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
     
     def _initialize_client(self):
-        """Initialize the DeepSeek client based on configuration."""
-        self.client = OpenAI(
+        """Initialize the DeepSeek client based on configuration.
+        
+        Each summarizer owns its connection pool, so repeated summaries reuse
+        the same TLS connection and closing one summarizer never affects another.
+        """
+        self.client = AsyncOpenAI(
             api_key=self.config.deepseek_api_key,
-            base_url="https://api.deepseek.com"
+            base_url="https://api.deepseek.com",
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                timeout=60.0
+            )
         )
         logger.info("DeepSeek client initialized")
     
+    async def aclose(self):
+        """Close the DeepSeek client and the connection pool it owns."""
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        await self.client.close()
+    
+    def start_warmup(self):
+        """Start opening a connection to DeepSeek in the background.
+        
+        Call this before loading tweet data so the TLS handshake overlaps
+        with the read; the summary request waits briefly for it to finish
+        so it reuses the warmed connection. Only the first call per
+        summarizer starts a task.
+        """
+        if self._warmup_task is None:
+            self._warmup_task = asyncio.create_task(self._warmup())
+    
+    async def _wait_for_warmup(self):
+        """Wait up to WARMUP_WAIT_TIMEOUT seconds for a pending warmup to finish."""
+        if self._warmup_task is None or self._warmup_task.done():
+            return
+        try:
+            # shield 讓逾時時不會取消暖機，連線仍可在背景建立完成
+            await asyncio.wait_for(asyncio.shield(self._warmup_task), WARMUP_WAIT_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.debug("DeepSeek warmup still pending, sending the summary request anyway")
+    
+    async def _warmup(self):
+        """Send a lightweight model listing request; failures are only logged."""
+        try:
+            await self.client.models.list()
+        except Exception as e:
+            logger.warning(f"DeepSeek warmup request failed: {str(e)}")
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
     async def generate_summary_from_json(self, json_file_path: str, hours: int = 24) -> str:
         """Generate a summary from a JSON file containing tweet data.
         
@@ -48,19 +126,66 @@ class AISummarizer:
             Generated summary text
         """
         try:
-            # 讀取 JSON 文件
-            with open(json_file_path, 'r', encoding='utf-8') as file:
-                tweets_data = json.load(file)
-                logger.info(f"Loaded {len(tweets_data)} tweets from JSON file")
-            return await self._generate_deepseek_json_summary(tweets_data, hours)
+            # 在背景預先建立與 DeepSeek 的連線，同時在執行緒中讀取 JSON 文件
+            self.start_warmup()
+            tweets_bytes = await asyncio.to_thread(Path(json_file_path).read_bytes)
+            tweets_data = orjson.loads(tweets_bytes)
+            logger.info(f"Loaded {len(tweets_data)} tweets from JSON file")
+            return await self.generate_summary_from_dict(tweets_data, hours)
 
         except Exception as e:
             logger.error(f"Error generating summary from JSON: {str(e)}", exc_info=True)
             raise
     
+    async def generate_summary_from_dict(self, tweets_data: Dict, hours: int = 24) -> str:
+        """Generate a summary from already parsed tweet data.
+        
+        Args:
+            tweets_data: Dictionary mapping usernames to lists of their tweets
+            hours: Number of hours the data covers
+            
+        Returns:
+            Generated summary text
+        """
+        return await self._generate_deepseek_json_summary(tweets_data, hours)
+    
+    async def stream_summary_from_dict(self, tweets_data: Dict, hours: int = 24) -> AsyncIterator[str]:
+        """Stream a summary from already parsed tweet data as it is generated.
+        
+        Args:
+            tweets_data: Dictionary mapping usernames to lists of their tweets
+            hours: Number of hours the data covers
+            
+        Yields:
+            Chunks of the summary text
+        """
+        async for chunk in self._stream_deepseek_summary(self._build_tweets_payload(tweets_data), hours):
+            yield chunk
+    
+    async def generate_summaries(self, jobs: List[Tuple[str, int]]) -> List[str]:
+        """Generate summaries for several JSON files concurrently.
+        
+        Args:
+            jobs: List of (json_file_path, hours) pairs
+            
+        Returns:
+            Generated summary texts, in the same order as jobs
+        """
+        # 限制同時進行的請求數，避免超過 DeepSeek 的速率限制
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SUMMARIES)
+        
+        async def _generate_one(json_file_path: str, hours: int) -> str:
+            async with semaphore:
+                return await self.generate_summary_from_json(json_file_path, hours)
+        
+        return await asyncio.gather(*[_generate_one(path, hours) for path, hours in jobs])
+    
     async def _generate_deepseek_json_summary(self, tweets_data: Dict, hours: int) -> str:
         """Generate a summary from JSON tweet data using DeepSeek's API.
         
+        Identical requests (same tweets, hours and model) are answered from
+        an in-memory cache instead of calling the API again.
+        
         Args:
             tweets_data: Dictionary containing tweet data
             hours: Number of hours the data covers
@@ -68,62 +193,123 @@ class AISummarizer:
         Returns:
             Generated summary text
         """
-        try:
-            # 計算所有推文的總數
-            total_tweets = sum(len(tweets) for tweets in tweets_data.values())
-            
-            # 準備推文數據的簡短表示
-            tweets_summary = []
-            for username, tweets in tweets_data.items():
-                for tweet in tweets:
-                    tweet_type = "轉推" if tweet.get('is_retweet', False) else "推文"
-                    tweet_info = {
-                        "username": username,
-                        "type": tweet_type,
-                        "text": tweet['text'],
-                        "created_at": tweet['created_at']
-                    }
-                    if tweet.get('is_retweet', False) and 'original_author' in tweet:
-                        tweet_info["original_author"] = tweet['original_author']
-                    tweets_summary.append(tweet_info)
-                    logger.info(f"Processed tweet: {tweet['text']}")
-            logger.info(f"Total tweets processed: {len(tweets_summary)}")
+        tweets_payload = self._build_tweets_payload(tweets_data)
+        cache_key = hashlib.sha256(orjson.dumps([tweets_payload, hours, self.config.deepseek_model])).hexdigest()
+        if cache_key in self._summary_cache:
+            logger.info("Using cached DeepSeek summary")
+            return self._summary_cache[cache_key]
+        
+        response = "".join([chunk async for chunk in self._stream_deepseek_summary(tweets_payload, hours)])
+        logger.info("DeepSeek JSON summary generated (%d characters)", len(response))
+        logger.debug("DeepSeek JSON summary: %s", response)
+        
+        # 超過上限時移除最早加入的摘要
+        if len(self._summary_cache) >= MAX_CACHED_SUMMARIES:
+            del self._summary_cache[next(iter(self._summary_cache))]
+        self._summary_cache[cache_key] = response
+        return response
+    
+    def _build_tweets_payload(self, tweets_data: Dict) -> str:
+        """Build the compact tweet listing embedded in the DeepSeek prompt.
+        
+        Each tweet is encoded straight into the output buffer, so no
+        intermediate list of per-tweet dictionaries is kept around.
+        
+        Args:
+            tweets_data: Dictionary containing tweet data
             
-            # Define the system prompt for summarization
-            system_prompt = """
-            你是一個專業的推特內容摘要助手。你的任務是分析並總結過去時間內的所有推文，提供一個全面且條理清晰的摘要。
-            """
+        Returns:
+            One compact JSON object per line (NDJSON), one line per tweet
+        """
+        dropped = self._tweets_over_budget(tweets_data)
+        log_tweets = logger.isEnabledFor(logging.DEBUG)
+        
+        # 每行一則推文的緊湊 JSON (NDJSON)，比縮排格式少用許多 token
+        payload = bytearray()
+        count = 0
+        for username, tweets in tweets_data.items():
+            for tweet in tweets:
+                if id(tweet) in dropped:
+                    continue
+                is_retweet = tweet.get('is_retweet', False)
+                if count:
+                    payload += b"\n"
+                payload += orjson.dumps({
+                    "username": username,
+                    "type": "轉推" if is_retweet else "推文",
+                    "text": tweet['text'],
+                    "created_at": tweet['created_at'],
+                    **({"original_author": tweet['original_author']} if is_retweet and 'original_author' in tweet else {})
+                })
+                count += 1
+                if log_tweets:
+                    logger.debug("Processed tweet: %s", tweet['text'])
+        logger.info("Total tweets processed: %d", count)
+        
+        return payload.decode("utf-8")
+    
+    def _tweets_over_budget(self, tweets_data: Dict) -> Set[int]:
+        """Pick the tweets to leave out so the prompt fits MAX_INPUT_TOKENS.
+        
+        Retweets are dropped before original tweets, and older tweets before
+        newer ones. Token counts are estimated as two characters per token,
+        which is close enough for mostly Chinese and Japanese text.
+        
+        Args:
+            tweets_data: Dictionary containing tweet data
             
-            user_prompt = f"""
-            請根據以下過去 {hours} 小時的推特數據，生成一份全面的摘要報告：
-
-            {json.dumps(tweets_summary, ensure_ascii=False, indent=2)}
-
-            要求：
-            1. 對過去 {hours} 小時所有用戶發文加總起來做一個總體摘要
-            2. 以條列式列出重要資訊和趨勢
-            3. 必須使用繁體中文回覆
-            4. 注意識別轉推與原創推文的區別
-            5. 重點關注與卡牌遊戲、Hololive 相關的內容
-            """
+        Returns:
+            The id() of every tweet dictionary that should be dropped
+        """
+        total_tokens = sum(len(tweet['text']) // 2 for tweets in tweets_data.values() for tweet in tweets)
+        if total_tokens <= MAX_INPUT_TOKENS:
+            return set()
+        
+        # 先捨棄轉推，同類型中較舊的先捨棄 (created_at 格式可直接依字串排序)
+        drop_order = sorted(
+            (tweet for tweets in tweets_data.values() for tweet in tweets),
+            key=lambda tweet: (not tweet.get('is_retweet', False), tweet['created_at'])
+        )
+        dropped = set()
+        for tweet in drop_order:
+            if total_tokens <= MAX_INPUT_TOKENS:
+                break
+            total_tokens -= len(tweet['text']) // 2
+            dropped.add(id(tweet))
+        
+        logger.warning("Tweet payload exceeds %d estimated tokens, dropped %d tweets", MAX_INPUT_TOKENS, len(dropped))
+        return dropped
+    
+    async def _stream_deepseek_summary(self, tweets_payload: str, hours: int) -> AsyncIterator[str]:
+        """Stream a summary of the prepared tweet payload using DeepSeek's API.
+        
+        Args:
+            tweets_payload: Tweet listing built by _build_tweets_payload
+            hours: Number of hours the data covers
             
-            # Run the DeepSeek API call in a thread pool to avoid blocking
-            def _call_deepseek_api():
-                response = self.client.chat.completions.create(
-                    model=self.config.deepseek_model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    temperature=1.3
-                )
-                return response.choices[0].message.content
+        Yields:
+            Chunks of the summary text as DeepSeek generates them
+        """
+        try:
+            user_prompt = USER_PROMPT_TEMPLATE.format(hours=hours, tweets_payload=tweets_payload)
             
-            # 使用 run_in_executor 替代 to_thread
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(self.executor, _call_deepseek_api)
-            logger.info(f"DeepSeek JSON summary generated: {response}")
-            return response
+            # 等待暖機完成，讓摘要請求重用已建立的連線，而不是另外開一條
+            await self._wait_for_warmup()
+            stream = await self.client.chat.completions.create(
+                model=self.config.deepseek_model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=1.3,
+                stream=True
+            )
+            # 呼叫端提前停止迭代時 GeneratorExit 不會進入 except，由 async with 關閉串流並歸還連線
+            async with stream:
+                async for chunk in stream:
+                    # 最後的用量統計 chunk 沒有 choices
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
             
         except Exception as e:
             logger.error(f"Error generating DeepSeek JSON summary: {str(e)}", exc_info=True)
@@ -144,11 +330,10 @@ async def main():
     args = parser.parse_args()
     
     # 創建配置和摘要器
-    config = Config()
-    summarizer = AISummarizer(config)
-    
-    # 生成摘要
-    summary = await summarizer.generate_summary_from_json(args.json, args.hours)
+    config = get_config()
+    async with AISummarizer(config) as summarizer:
+        # 生成摘要
+        summary = await summarizer.generate_summary_from_json(args.json, args.hours)
     print(summary)
 
 if __name__ == "__main__":
@@ -4,54 +4,136 @@ Handles loading and providing access to all configuration settings.
 """
 
 import os
-from typing import List
+from functools import cached_property, lru_cache
+from typing import List, Optional
+
+def _positive_int_env(name: str, default: int) -> int:
+    """Read a positive integer from the environment.
+    
+    A missing or blank variable means the default.
+    
+    Raises:
+        ValueError: If the variable is set to anything but a positive integer
+    """
+    value = os.getenv(name, '').strip()
+    if not value:
+        return default
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError(f"{name} must be a positive integer, got {value!r}")
+    return int(value)
 
 class Config:
-    """Configuration class that loads and provides access to all settings."""
-    
-    def __init__(self):
-        """Initialize configuration by loading from environment variables."""
-        # Discord settings
-        self.discord_token = os.getenv('DISCORD_TOKEN')
-        self.summary_channel_id = os.getenv('SUMMARY_CHANNEL_ID', '')
-        self.discord_guild_id = os.getenv('DISCORD_GUILD_ID')
-        self.discord_channel_id = os.getenv('DISCORD_CHANNEL_ID')
-        
-        # Twitter users to monitor
+    """Configuration class that loads and provides access to all settings.
+    
+    Each setting is read from the environment the first time it is accessed,
+    so code paths only pay for the settings they actually use.
+    """
+    
+    # Discord settings
+    @cached_property
+    def discord_token(self) -> Optional[str]:
+        return os.getenv('DISCORD_TOKEN')
+    
+    @cached_property
+    def summary_channel_id(self) -> str:
+        return os.getenv('SUMMARY_CHANNEL_ID', '')
+    
+    @cached_property
+    def discord_guild_id(self) -> Optional[str]:
+        return os.getenv('DISCORD_GUILD_ID')
+    
+    @cached_property
+    def discord_channel_id(self) -> Optional[str]:
+        return os.getenv('DISCORD_CHANNEL_ID')
+    
+    # Twitter users to monitor
+    @cached_property
+    def twitter_users(self) -> List[str]:
         twitter_users_str = os.getenv('TWITTER_USERS', '')
-        self.twitter_users = [user.strip() for user in twitter_users_str.split(',') if user.strip()]
-        
-        # Twitter API settings (not needed with snscrape, but kept for compatibility)
-        self.twitter_bearer_token = os.getenv('TWITTER_BEARER_TOKEN')
-        self.twitter_api_key = os.getenv('TWITTER_API_KEY')
-        self.twitter_api_secret = os.getenv('TWITTER_API_SECRET')
-        self.twitter_access_token = os.getenv('TWITTER_ACCESS_TOKEN')
-        self.twitter_access_secret = os.getenv('TWITTER_ACCESS_SECRET')
-        self.twitter_email = os.getenv('TWITTER_EMAIL')
-        self.twitter_password = os.getenv('TWITTER_PASSWORD')
-        
-        # AI provider settings
-        self.ai_provider = os.getenv('AI_PROVIDER', 'openai').lower()
-        
-        # OpenAI settings
-        self.openai_api_key = os.getenv('OPENAI_API_KEY')
-        self.openai_model = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
-        
-        # DeepSeek settings
-        self.deepseek_api_key = os.getenv('DEEPSEEK_API_KEY')
-        self.deepseek_model = os.getenv('DEEPSEEK_MODEL')
-        
-        # Validate configuration
-        self._validate_config()
+        return [user.strip() for user in twitter_users_str.split(',') if user.strip()]
+    
+    # Number of users fetched concurrently over HTTP; network-bound, so this
+    # can be well above the CPU count
+    @cached_property
+    def twitter_max_workers(self) -> int:
+        default = min(len(self.twitter_users), 4 * (os.cpu_count() or 4), 32)
+        return _positive_int_env('TWITTER_MAX_WORKERS', max(1, default))
+    
+    # Number of Chrome instances the Selenium fallback may run at once.
+    # Each one keeps roughly 300MB resident, so size this to the host's RAM.
+    @cached_property
+    def twitter_max_browsers(self) -> int:
+        default = min(len(self.twitter_users), os.cpu_count() or 4)
+        return _positive_int_env('TWITTER_MAX_BROWSERS', max(1, default))
+    
+    # Twitter API settings (not needed with snscrape, but kept for compatibility)
+    @cached_property
+    def twitter_bearer_token(self) -> Optional[str]:
+        return os.getenv('TWITTER_BEARER_TOKEN')
     
-    def _validate_config(self):
-        """Validate that all required configuration is present."""
+    @cached_property
+    def twitter_api_key(self) -> Optional[str]:
+        return os.getenv('TWITTER_API_KEY')
+    
+    @cached_property
+    def twitter_api_secret(self) -> Optional[str]:
+        return os.getenv('TWITTER_API_SECRET')
+    
+    @cached_property
+    def twitter_access_token(self) -> Optional[str]:
+        return os.getenv('TWITTER_ACCESS_TOKEN')
+    
+    @cached_property
+    def twitter_access_secret(self) -> Optional[str]:
+        return os.getenv('TWITTER_ACCESS_SECRET')
+    
+    @cached_property
+    def twitter_email(self) -> Optional[str]:
+        return os.getenv('TWITTER_EMAIL')
+    
+    @cached_property
+    def twitter_password(self) -> Optional[str]:
+        return os.getenv('TWITTER_PASSWORD')
+    
+    # AI provider settings
+    @cached_property
+    def ai_provider(self) -> str:
+        return os.getenv('AI_PROVIDER', 'openai').lower()
+    
+    # OpenAI settings
+    @cached_property
+    def openai_api_key(self) -> Optional[str]:
+        return os.getenv('OPENAI_API_KEY')
+    
+    @cached_property
+    def openai_model(self) -> str:
+        return os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+    
+    # DeepSeek settings
+    @cached_property
+    def deepseek_api_key(self) -> Optional[str]:
+        return os.getenv('DEEPSEEK_API_KEY')
+    
+    @cached_property
+    def deepseek_model(self) -> Optional[str]:
+        return os.getenv('DEEPSEEK_MODEL')
+    
+    def validate(self):
+        """Validate that all required configuration is present.
+        
+        Returns:
+            The validated configuration, for chaining
+        """
         if not self.discord_token:
             raise ValueError("DISCORD_TOKEN environment variable is required")
         
         if not self.twitter_users:
             raise ValueError("TWITTER_USERS environment variable is required and must contain at least one username")
         
+        # Parse the concurrency limits now so a bad value fails at startup, not on the first fetch
+        self.twitter_max_workers
+        self.twitter_max_browsers
+        
         if self.ai_provider not in ['openai', 'deepseek']:
             raise ValueError("AI_PROVIDER must be either 'openai' or 'deepseek'")
         
@@ -60,3 +142,18 @@ class Config:
         
         if self.ai_provider == 'deepseek' and not self.deepseek_api_key:
             raise ValueError("DEEPSEEK_API_KEY environment variable is required when using DeepSeek")
+        
+        return self
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Return the shared, validated configuration.
+    
+    The environment is read and validated once per process; call
+    load_dotenv() before the first call so .env values are picked up.
+    
+    Returns:
+        The process-wide Config instance
+    """
+    return Config().validate()
@@ -2,12 +2,24 @@
 Tweet formatter module for organizing and formatting tweets for display and summarization.
 """
 
+import io
 import logging
+import functools
+from operator import itemgetter
 from typing import Dict, List, Any
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Sort key for tweets; itemgetter runs in C instead of a Python lambda frame per call
+_created_at_key = itemgetter('created_at')
+
+@functools.lru_cache(maxsize=4096)
+def _format_timestamp(created_at: datetime) -> str:
+    """Format a tweet's creation time once and reuse it across both formatters."""
+    # isoformat skips strftime's format parsing; drop tzinfo so no +00:00 suffix is added
+    return created_at.replace(tzinfo=None).isoformat(sep=' ', timespec='seconds') + ' UTC'
+
 class TweetFormatter:
     """Formatter for organizing and formatting tweets for display and summarization."""
     
@@ -27,7 +39,7 @@ class TweetFormatter:
                 continue
                 
             # Sort tweets by creation time (newest first)
-            sorted_tweets = sorted(tweets, key=lambda x: x['created_at'], reverse=True)
+            sorted_tweets = sorted(tweets, key=_created_at_key, reverse=True)
             
             # Add user section header
             formatted_text.append(f"## @{username} ({len(sorted_tweets)} tweets)")
@@ -35,7 +47,7 @@ class TweetFormatter:
             # Add each tweet with metadata
             for tweet in sorted_tweets:
                 # Format the timestamp
-                timestamp = tweet['created_at'].strftime("%Y-%m-%d %H:%M:%S UTC")
+                timestamp = _format_timestamp(tweet['created_at'])
                 
                 # Format engagement metrics
                 engagement = f"❤️ {tweet['likes']} | 🔄 {tweet['retweets']}"
@@ -61,8 +73,7 @@ class TweetFormatter:
             List of formatted strings, each within Discord's message length limit
         """
         formatted_messages = []
-        current_message = []
-        current_length = 0
+        buf = io.StringIO()
         
         # Discord message length limit (leaving some room for safety)
         MAX_LENGTH = 1900
@@ -72,59 +83,53 @@ class TweetFormatter:
                 continue
                 
             # Sort tweets by creation time (newest first)
-            sorted_tweets = sorted(tweets, key=lambda x: x['created_at'], reverse=True)
+            sorted_tweets = sorted(tweets, key=_created_at_key, reverse=True)
             
             # Create user section header
             user_header = f"**@{username}** ({len(sorted_tweets)} tweets)\n"
             
             # Check if adding this section would exceed the limit
-            if current_length + len(user_header) > MAX_LENGTH and current_message:
+            if buf.tell() + len(user_header) > MAX_LENGTH and buf.tell():
                 # Save current message and start a new one
-                formatted_messages.append("\n".join(current_message))
-                current_message = []
-                current_length = 0
+                formatted_messages.append(buf.getvalue())
+                buf = io.StringIO()
             
             # Add user section header
-            current_message.append(user_header)
-            current_length += len(user_header)
+            buf.write(user_header)
             
             # Add each tweet with metadata
             for tweet in sorted_tweets:
                 # Format the timestamp
-                timestamp = tweet['created_at'].strftime("%Y-%m-%d %H:%M:%S UTC")
+                timestamp = _format_timestamp(tweet['created_at'])
                 
                 # Format the tweet
                 tweet_text = f"• [{timestamp}] {tweet['text']}\n"
                 tweet_meta = f"  ❤️ {tweet['likes']} | 🔄 {tweet['retweets']} | {tweet['url']}\n\n"
                 
                 # Check if adding this tweet would exceed the limit
-                if current_length + len(tweet_text) + len(tweet_meta) > MAX_LENGTH:
+                if buf.tell() + len(tweet_text) + len(tweet_meta) > MAX_LENGTH:
                     # Save current message and start a new one
-                    formatted_messages.append("\n".join(current_message))
-                    current_message = []
-                    current_length = 0
+                    formatted_messages.append(buf.getvalue())
+                    buf = io.StringIO()
                 
                 # Add the tweet
-                current_message.append(tweet_text)
-                current_message.append(tweet_meta)
-                current_length += len(tweet_text) + len(tweet_meta)
+                buf.write(tweet_text)
+                buf.write(tweet_meta)
             
             # Add separator between users
             separator = "-" * 40 + "\n"
             
             # Check if adding the separator would exceed the limit
-            if current_length + len(separator) > MAX_LENGTH:
+            if buf.tell() + len(separator) > MAX_LENGTH:
                 # Save current message and start a new one
-                formatted_messages.append("\n".join(current_message))
-                current_message = []
-                current_length = 0
+                formatted_messages.append(buf.getvalue())
+                buf = io.StringIO()
             
             # Add the separator
-            current_message.append(separator)
-            current_length += len(separator)
+            buf.write(separator)
         
         # Add any remaining content
-        if current_message:
-            formatted_messages.append("\n".join(current_message))
+        if buf.tell():
+            formatted_messages.append(buf.getvalue())
         
         return formatted_messages
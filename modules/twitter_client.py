@@ -1,18 +1,26 @@
 """
 Twitter client module for fetching tweets from specified users.
-Uses Selenium to scrape Twitter without API limitations.
+Reads the public syndication timeline over HTTP and falls back to
+scraping with Selenium when it is unavailable.
 """
 
 import logging
 import asyncio
-import time
-import json
 import re
 import os
 import pickle
+import queue
+import random
+import sqlite3
+import sys
+import threading
+import weakref
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
 import concurrent.futures
+import aiohttp
+import orjson
 from modules.config import Config
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -20,69 +28,339 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.keys import Keys
 from webdriver_manager.chrome import ChromeDriverManager
 
 logger = logging.getLogger(__name__)
 
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 持久化推文緩存的 SQLite 資料庫，讓 bot 重啟後仍可使用未過期的緩存
+CACHE_DB_FILE = os.path.join(PROJECT_DIR, 'twitter_cache.sqlite')
+
+# 公開的 syndication 時間線頁面，內嵌的 __NEXT_DATA__ JSON 含有最近的推文
+SYNDICATION_TIMELINE_URL = "https://syndication.twitter.com/srv/timeline-profile/screen-name/{username}"
+NEXT_DATA_RE = re.compile(r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>', re.S)
+TWITTER_DATE_FORMAT = "%a %b %d %H:%M:%S %z %Y"
+# 每個 syndication 請求的逾時；傳入的共用 session 可能使用 aiohttp 預設的 300 秒，因此在請求上個別指定
+SYNDICATION_TIMEOUT = aiohttp.ClientTimeout(total=30)
+# 網頁 <time datetime> 使用 Z 結尾的 UTC 時間，Python 3.11 之前的 fromisoformat 無法解析
+FROMISOFORMAT_PARSES_Z = sys.version_info >= (3, 11)
+
+# Selenium 抓取時重複使用的正則表達式與 CSS 選擇器
+STATUS_ID_RE = re.compile(r"/status/(\d+)")
+IMAGE_SIZE_RE = re.compile(r"&name=\w+")
+TWEET_SELECTOR = "article[data-testid='tweet']"
+PRIMARY_COLUMN_SELECTOR = "div[data-testid='primaryColumn']"
+# cookies 過期時 Twitter 會把頁面導向登入頁
+LOGIN_URL_RE = re.compile(r"^https?://[^/]+/(?:i/flow/)?login(?:[/?#]|$)")
+# 只回傳可見推文的數量與最後一則推文元素，用於判斷滾動後是否載入了新推文
+LAST_TWEET_JS = """
+const articles = document.querySelectorAll("article[data-testid='tweet']");
+return [articles.length, articles.length ? articles[articles.length - 1] : null];
+"""
+# 用戶頁面載入推文時呼叫的 GraphQL API
+USER_TWEETS_GRAPHQL_RE = re.compile(r"/i/api/graphql/[^/]+/UserTweets")
+# 使用 GraphQL 資料時，連續滾動這麼多次都沒有新的 UserTweets 回應就停止滾動
+MAX_SCROLLS_WITHOUT_GRAPHQL = 3
+# Selenium 瀏覽器不需要載入的資源
+# twimg 的圖片網址多半沒有副檔名，而是以 ?format=jpg&name=small 指定格式，影片則來自 video.twimg.com，
+# 因此除了副檔名之外也依主機與 format 參數封鎖；img.src 仍會保留網址，不影響圖片連結的擷取
+BLOCKED_RESOURCE_URLS = [
+    "*pbs.twimg.com/media/*", "*pbs.twimg.com/profile_images/*", "*pbs.twimg.com/card_img/*",
+    "*pbs.twimg.com/*_video_thumb/*", "*video.twimg.com/*",
+    "*format=jpg*", "*format=png*", "*format=webp*",
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.mp4", "*.m3u8", "*.m4s", "*.woff", "*.woff2", "*.ttf"
+]
+# 在頁面內一次取出所有可見推文的資料，取代逐個元素的 WebDriver 查詢
+# arguments[0] 為已處理過的推文 ID，這些推文在頁面內就會被略過，不再回傳
+EXTRACT_TWEETS_JS = """
+const seen = new Set(arguments[0]);
+const results = [];
+for (const article of document.querySelectorAll("article[data-testid='tweet']")) {
+    const link = article.querySelector("a[href*='/status/']");
+    const match = link && link.href.match(/\\/status\\/(\\d+)/);
+    if (match && seen.has(match[1])) {
+        continue;
+    }
+    const authorLinks = article.querySelectorAll("div[data-testid='User-Name'] a");
+    const text = article.querySelector("div[data-testid='tweetText']");
+    const time = article.querySelector("time");
+    // 置頂、轉推等推文上方會有 socialContext 標示
+    const socialContext = article.querySelector("[data-testid='socialContext']");
+    results.push({
+        url: link ? link.href : null,
+        author_url: authorLinks.length >= 2 ? authorLinks[1].href : null,
+        text: text ? text.innerText : "",
+        datetime: time ? time.getAttribute("datetime") : null,
+        image_urls: Array.from(article.querySelectorAll("div[data-testid='tweetPhoto'] img"), img => img.src),
+        has_social_context: socialContext !== null
+    });
+}
+return results;
+"""
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36"
+
+def _quit_drivers(drivers):
+    """Quit every pooled WebDriver, ignoring browsers that already exited."""
+    while drivers:
+        driver = drivers.pop()
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"關閉瀏覽器時出錯: {str(e)}")
+
+def _to_columns(tweets: List[Dict[str, Any]]) -> Dict[str, tuple]:
+    """Convert a list of tweet dictionaries into one tuple per field for caching.
+    
+    Keeping each field in its own tuple avoids a dict (and its key table) per
+    cached tweet. original_author is None for tweets that are not retweets.
+    """
+    return {
+        'id': tuple(tweet['id'] for tweet in tweets),
+        'text': tuple(tweet['text'] for tweet in tweets),
+        'created_at': tuple(tweet['created_at'] for tweet in tweets),
+        'image_urls': tuple(tuple(tweet['image_urls']) for tweet in tweets),
+        'url': tuple(tweet['url'] for tweet in tweets),
+        'is_retweet': tuple(tweet['is_retweet'] for tweet in tweets),
+        'original_author': tuple(tweet.get('original_author') for tweet in tweets),
+    }
+
+def _from_columns(columns: Dict[str, tuple]) -> List[Dict[str, Any]]:
+    """Rebuild the tweet dictionaries returned to callers from cached columns."""
+    tweets = []
+    for tweet_id, text, created_at, image_urls, url, is_retweet, original_author in zip(
+        columns['id'], columns['text'], columns['created_at'], columns['image_urls'],
+        columns['url'], columns['is_retweet'], columns['original_author']
+    ):
+        tweet_data = {
+            'id': tweet_id,
+            'text': text,
+            'created_at': created_at,
+            'image_urls': list(image_urls),
+            'url': url,
+            'is_retweet': is_retweet
+        }
+        if original_author is not None:
+            tweet_data['original_author'] = original_author
+        tweets.append(tweet_data)
+    return tweets
+
+def _legacy_tweet_data(source: Dict[str, Any], author: str, is_retweet: bool) -> Dict[str, Any]:
+    """Build a tweet dictionary from a v1.1-style tweet object.
+    
+    Both the syndication timeline and the legacy part of GraphQL results use
+    this shape. For retweets, pass the original tweet and its author.
+    """
+    media = (source.get('extended_entities') or source.get('entities') or {}).get('media', [])
+    tweet_data = {
+        'id': source['id_str'],
+        'text': source.get('full_text') or source.get('text', ''),
+        'created_at': datetime.strptime(source['created_at'], TWITTER_DATE_FORMAT),
+        'image_urls': [f"{item['media_url_https']}?name=orig" for item in media if item.get('type') == 'photo'],
+        'url': f"https://twitter.com/{author}/status/{source['id_str']}",
+        'is_retweet': is_retweet
+    }
+    if is_retweet:
+        tweet_data['original_author'] = author.lower()
+    return tweet_data
+
+def _unwrap_tweet_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the tweet inside a GraphQL TweetWithVisibilityResults wrapper, if any."""
+    if result.get('__typename') == 'TweetWithVisibilityResults':
+        return result['tweet']
+    return result
+
+def _graphql_screen_name(result: Dict[str, Any]) -> str:
+    """Return the author's screen name from a GraphQL tweet result."""
+    user = result['core']['user_results']['result']
+    return (user.get('legacy') or {}).get('screen_name') or user['core']['screen_name']
+
+def _iter_graphql_tweet_results(payload: Dict[str, Any]):
+    """Yield (tweet result, has social context) for every tweet in a UserTweets GraphQL response.
+    
+    Pinned tweets come from a TimelinePinEntry instruction and carry a
+    socialContext, so they are flagged and can be kept out of time checks.
+    """
+    user_result = payload['data']['user']['result']
+    timeline = (user_result.get('timeline_v2') or user_result['timeline'])['timeline']
+    for instruction in timeline['instructions']:
+        pinned = instruction.get('type') == 'TimelinePinEntry'
+        entries = instruction.get('entries') or ([instruction['entry']] if 'entry' in instruction else [])
+        for entry in entries:
+            content = entry.get('content') or {}
+            # 一般推文直接在 itemContent 中，對話串則在 items 之下
+            for item in [content, *((item.get('item') or {}) for item in content.get('items', []))]:
+                item_content = item.get('itemContent') or {}
+                result = (item_content.get('tweet_results') or {}).get('result')
+                if result:
+                    yield _unwrap_tweet_result(result), pinned or bool(item_content.get('socialContext'))
+
 class TwitterClient:
     """Client for interacting with Twitter using Selenium."""
     
-    def __init__(self, config: Config):
+    # 解析出的 ChromeDriver 路徑，所有實例共用，只需透過 webdriver_manager 查詢一次
+    _chromedriver_path = None
+    
+    def __init__(self, config: Config, session: Optional[aiohttp.ClientSession] = None,
+                 cache_db_path: Optional[str] = CACHE_DB_FILE):
         """Initialize the Twitter client with the provided configuration.
         
         Args:
             config: Configuration object containing Twitter usernames to monitor
+            session: Optional HTTP session to reuse; one is created on first use otherwise
+            cache_db_path: SQLite file used to persist the tweet cache, or None to keep it in memory only
         """
         self.config = config
+        # 抓取 syndication 時間線使用的 HTTP session
+        self._session = session
+        self._owns_session = False
+        # HTTP 抓取屬於 I/O 密集工作，同時抓取的用戶數可以多於 CPU 核心數
+        self.max_workers = config.twitter_max_workers
+        # 每個 Selenium 工作執行緒各自佔用一個 Chrome (約 300MB)，數量另外以 TWITTER_MAX_BROWSERS 限制
+        self.max_browsers = config.twitter_max_browsers
         # 創建執行緒池
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_browsers)
+        # 客戶端被回收或程式結束時關閉執行緒池，避免閒置執行緒殘留
+        weakref.finalize(self, self.executor.shutdown, wait=False)
+        
+        # 已登入的瀏覽器池，跨呼叫重複使用以省去啟動 Chrome 與套用 cookies 的時間
+        self._driver_pool = queue.Queue()
+        self._drivers = []
+        self._drivers_lock = threading.Lock()
+        weakref.finalize(self, _quit_drivers, self._drivers)
         
-        # 添加緩存以減少請求
-        self._user_ids_cache = None
-        self._user_ids_cache_time = None
-        self._tweets_cache = {}
-        self._tweets_cache_time = {}
-        self._search_cache = {}
-        self._search_cache_time = {}
+        # 以 (用戶名, 小時數) 為鍵分別緩存，每個用戶獨立過期，超過上限時移除最久未使用的項目
+        # 每個項目為 (過期時間, 推文欄位)，推文以欄位為單位保存（見 _to_columns），返回時才轉換回推文字典
+        self._tweets_cache: "OrderedDict[Tuple[str, int], Tuple[datetime, Dict[str, tuple]]]" = OrderedDict()
+        self.max_cache_entries = 256
+        # 正在抓取中的用戶，重複的請求會等待同一個任務而不是再開一次抓取
+        self._tweets_cache_inflight: Dict[Tuple[str, int], asyncio.Future] = {}
         
         # 緩存有效期（分鐘）
         self.cache_ttl_minutes = 5
         
+        # 從 SQLite 載入上次執行時尚未過期的緩存；之後的寫入在執行緒中進行，以鎖保護連線
+        self._db_lock = threading.Lock()
+        self._db = self._open_cache_db(cache_db_path) if cache_db_path else None
+        if self._db is not None:
+            self._load_cached_tweets()
+        
         # Cookie 文件路徑
-        self.cookie_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'twitter_cookies.pkl')
-        self.cookie_json_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'twitter_cookies.pkl.json')
+        self.cookie_file = os.path.join(PROJECT_DIR, 'twitter_cookies.json')
         
         # 嘗試加載 cookies
         self._cookies = self._load_cookies()
     
+    def _open_cache_db(self, path: str) -> Optional[sqlite3.Connection]:
+        """Open the persistent tweet cache, returning None if it cannot be used."""
+        try:
+            db = sqlite3.connect(path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS tweets_cache("
+                "user TEXT, hours INTEGER, fetched_at REAL, expires_at REAL, payload BLOB, "
+                "PRIMARY KEY(user, hours))"
+            )
+            db.commit()
+            return db
+        except sqlite3.Error as e:
+            logger.warning(f"無法開啟推文緩存資料庫 {path}: {str(e)}")
+            return None
+    
+    def _load_cached_tweets(self):
+        """Load unexpired entries from the SQLite cache into memory."""
+        now = datetime.now(timezone.utc).timestamp()
+        try:
+            self._db.execute("DELETE FROM tweets_cache WHERE expires_at <= ?", (now,))
+            self._db.commit()
+            rows = self._db.execute(
+                "SELECT user, hours, expires_at, payload FROM tweets_cache WHERE expires_at > ? "
+                "ORDER BY fetched_at DESC LIMIT ?",
+                (now, self.max_cache_entries)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"讀取推文緩存資料庫時出錯: {str(e)}")
+            return
+        
+        # 由舊到新放入，讓最近抓取的項目排在 LRU 的尾端
+        for user, hours, expires_at, payload in reversed(rows):
+            try:
+                columns = {field: tuple(values) for field, values in orjson.loads(payload).items()}
+                columns['created_at'] = tuple(datetime.fromisoformat(value) for value in columns['created_at'])
+                columns['image_urls'] = tuple(tuple(urls) for urls in columns['image_urls'])
+            except (orjson.JSONDecodeError, AttributeError, KeyError, TypeError, ValueError) as e:
+                logger.warning(f"略過損壞的推文緩存 {user} ({hours} 小時): {str(e)}")
+                continue
+            self._tweets_cache[(user, hours)] = (datetime.fromtimestamp(expires_at, timezone.utc), columns)
+        logger.info(f"從緩存資料庫載入 {len(rows)} 筆推文緩存")
+    
     def _load_cookies(self):
         """從文件加載 Twitter cookies。
         
+        Cookies 以 JSON 保存，只包含名稱、值、網域等純資料。舊版的 pickle
+        文件會在第一次讀取時轉換為 JSON 並刪除，之後不再使用 pickle。
+        
         Returns:
             List of cookie dictionaries or None if file not found or error
         """
         try:
-            # 首先嘗試從 JSON 文件加載
-            if os.path.exists(self.cookie_json_file):
-                logger.info(f"從 JSON 文件加載 cookies: {self.cookie_json_file}")
-                with open(self.cookie_json_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            # 如果 JSON 不存在，嘗試從 pickle 文件加載
-            elif os.path.exists(self.cookie_file):
-                logger.info(f"從 pickle 文件加載 cookies: {self.cookie_file}")
+            if not os.path.exists(self.cookie_file):
+                self._migrate_legacy_cookies()
+            
+            if os.path.exists(self.cookie_file):
+                logger.info(f"從 JSON 文件加載 cookies: {self.cookie_file}")
                 with open(self.cookie_file, 'rb') as f:
-                    cookies = pickle.load(f)
-                logger.info(f"已從 {self.cookie_file} 加載 {len(cookies)} 個 cookies")
-                return cookies
-            else:
-                logger.warning(f"Cookie 文件 {self.cookie_file} 不存在")
-                return None
+                    return orjson.loads(f.read())
+            
+            logger.warning(f"Cookie 文件 {self.cookie_file} 不存在")
+            return None
         except Exception as e:
             logger.error(f"加載 cookies 時出錯: {str(e)}")
             return None
     
+    def _migrate_legacy_cookies(self):
+        """Convert cookies saved by older versions (pickle, pickle.json) to the JSON cookie file."""
+        legacy_pickle_file = os.path.join(PROJECT_DIR, 'twitter_cookies.pkl')
+        legacy_json_file = f"{legacy_pickle_file}.json"
+        
+        if os.path.exists(legacy_json_file):
+            os.replace(legacy_json_file, self.cookie_file)
+        elif os.path.exists(legacy_pickle_file):
+            # 只在轉換時讀取一次舊的 pickle 文件
+            with open(legacy_pickle_file, 'rb') as f:
+                cookies = pickle.load(f)
+            with open(self.cookie_file, 'wb') as f:
+                f.write(orjson.dumps(cookies, option=orjson.OPT_INDENT_2))
+        else:
+            return
+        
+        if os.path.exists(legacy_pickle_file):
+            os.remove(legacy_pickle_file)
+        logger.info(f"已將舊版 cookies 轉換為 JSON 文件: {self.cookie_file}")
+    
+    @classmethod
+    def _get_chromedriver_path(cls) -> Optional[str]:
+        """Return the ChromeDriver binary to use, resolving it only once per process.
+        
+        CHROMEDRIVER_PATH pins a local binary and skips webdriver_manager's
+        network version check entirely.
+        
+        Returns:
+            Path to the ChromeDriver binary, or None to let Selenium locate one itself
+        """
+        if cls._chromedriver_path is None:
+            env_path = os.getenv('CHROMEDRIVER_PATH')
+            if env_path:
+                cls._chromedriver_path = env_path
+            else:
+                try:
+                    cls._chromedriver_path = ChromeDriverManager().install()
+                except Exception as e:
+                    logger.warning(f"無法透過 webdriver_manager 取得 ChromeDriver，改由 Selenium 自行尋找: {str(e)}")
+        return cls._chromedriver_path
+    
     def _setup_driver(self):
         """Set up and return a configured Chrome WebDriver."""
         chrome_options = Options()
@@ -95,22 +373,64 @@ class TwitterClient:
         chrome_options.add_argument("--disable-infobars")
         chrome_options.add_argument("--mute-audio")
         chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36")
+        chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+        # 只需要讀取文字與圖片網址，不下載圖片內容
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        # 開啟 performance log 以便讀取頁面發出的 GraphQL 回應
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
         
-        service = Service(ChromeDriverManager().install())
+        service = Service(self._get_chromedriver_path())
         driver = webdriver.Chrome(service=service, options=chrome_options)
         driver.set_page_load_timeout(30)
+        # 封鎖圖片、影片與字型請求，減少每個頁面的下載量
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCE_URLS})
+        return driver
+    
+    def _acquire_driver(self):
+        """Take a logged-in driver from the pool, starting a new one if none is idle.
+        
+        Returns:
+            A WebDriver with the saved cookies applied, or None if login failed
+        """
+        try:
+            return self._driver_pool.get_nowait()
+        except queue.Empty:
+            pass
+        
+        driver = self._setup_driver()
+        if not self._apply_cookies(driver):
+            driver.quit()
+            return None
+        with self._drivers_lock:
+            self._drivers.append(driver)
         return driver
     
+    def _discard_driver(self, driver):
+        """Quit a driver that ended up in a bad state instead of returning it to the pool."""
+        with self._drivers_lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"關閉瀏覽器時出錯: {str(e)}")
+    
+    def _wait_for_page_load(self, driver, timeout: int = 10):
+        """Wait until the current page reports document.readyState == 'complete'."""
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+    
     def _apply_cookies(self, driver):
         if not self._cookies:
             logger.error("沒有可用的 cookies，請先運行 'python get_twitter_cookies.py' 手動登入並保存 cookies")
             logger.error("注意：get_twitter_cookies.py 會打開瀏覽器並需要您手動完成登入操作")
             
             # 檢查 cookies 文件是否存在
-            cookies_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "twitter_cookies.pkl")
-            if not os.path.exists(cookies_path):
-                logger.error(f"找不到 cookies 文件: {cookies_path}")
+            if not os.path.exists(self.cookie_file):
+                logger.error(f"找不到 cookies 文件: {self.cookie_file}")
             else:
                 logger.error(f"cookies 文件存在但無法載入，可能已過期或損壞，請重新運行 get_twitter_cookies.py")
             
@@ -119,7 +439,7 @@ class TwitterClient:
         try:
             # 首先訪問 Twitter 域名
             driver.get("https://twitter.com")
-            time.sleep(2)
+            self._wait_for_page_load(driver)
             
             # 添加保存的 cookies
             for cookie in self._cookies:
@@ -135,12 +455,12 @@ class TwitterClient:
             
             # 刷新頁面以應用 cookies
             driver.refresh()
-            time.sleep(3)
+            self._wait_for_page_load(driver)
             
             # 檢查是否已登入
             try:
                 WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-testid='primaryColumn']"))
+                    EC.presence_of_element_located((By.CSS_SELECTOR, PRIMARY_COLUMN_SELECTOR))
                 )
                 logger.info("成功使用 cookies 登入 Twitter")
                 return True
@@ -152,225 +472,527 @@ class TwitterClient:
             logger.error(f"應用 cookies 時出錯: {str(e)}")
             return False
     
-    async def get_recent_tweets(self, hours: int = 24) -> Dict[str, List[Dict[str, Any]]]:
-        cache_key = f"tweets_{hours}"
-        current_time = datetime.now(timezone.utc)
+    def _reapply_cookies(self, driver) -> bool:
+        """Reload the cookies file and log a pooled driver in again after its session expired."""
+        logger.warning("Redirected to login page, reapplying cookies")
+        self._cookies = self._load_cookies()
+        return self._apply_cookies(driver)
+    
+    def _read_graphql_tweets(self, driver, pending_requests: set):
+        """Collect tweets from UserTweets GraphQL responses seen since the last call.
         
-        if (cache_key in self._tweets_cache and 
-            cache_key in self._tweets_cache_time and 
-            (current_time - self._tweets_cache_time[cache_key]).total_seconds() < self.cache_ttl_minutes * 60):
-            logger.info(f"Using cached tweets for {hours} hours")
-            return self._tweets_cache[cache_key]
+        Reads Network events from Chrome's performance log and fetches the
+        body of each finished UserTweets request over CDP.
         
-        tweets_by_user = {username.lower(): [] for username in self.config.twitter_users}
+        Args:
+            driver: WebDriver created by _setup_driver
+            pending_requests: Request ids of UserTweets responses whose body has
+                not been read yet; carried over between calls
+            
+        Returns:
+            List of (tweet dictionary, has social context) pairs, where the
+            flag marks pinned tweets, or None if no UserTweets response has
+            finished loading since the last call or none of them could be
+            parsed, so the caller should read the tweets from the DOM instead
+        """
+        finished_requests = []
+        for log_entry in driver.get_log("performance"):
+            message = orjson.loads(log_entry['message'])['message']
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.responseReceived' and USER_TWEETS_GRAPHQL_RE.search(params['response']['url']):
+                pending_requests.add(params['requestId'])
+            elif method == 'Network.loadingFinished' and params.get('requestId') in pending_requests:
+                pending_requests.discard(params['requestId'])
+                finished_requests.append(params['requestId'])
         
-        # Calculate the start time for tweet retrieval
-        start_time = datetime.now(timezone.utc) - timedelta(hours=hours)
-        logger.info(f"start time: {start_time}")
+        if not finished_requests:
+            return None
         
-        def _get_user_tweets(username):
-            driver = None
+        tweets = []
+        parsed_any = False
+        for request_id in finished_requests:
+            response_tweets = []
             try:
-                driver = self._setup_driver()
-                
-                # 嘗試使用 cookies 登入
-                if not self._apply_cookies(driver):
-                    logger.warning("無法使用 cookies 登入 Twitter，請先運行 get_twitter_cookies.py 獲取有效的 cookies")
-                    logger.warning("注意：get_twitter_cookies.py 會打開瀏覽器並需要您手動完成登入操作")
-                    
-                    # 檢查 cookies 文件是否存在
-                    cookies_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "twitter_cookies.pkl")
-                    if not os.path.exists(cookies_path):
-                        logger.error(f"找不到 cookies 文件: {cookies_path}")
+                body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})['body']
+                for result, has_social_context in _iter_graphql_tweet_results(orjson.loads(body)):
+                    legacy = result.get('legacy')
+                    if not legacy:
+                        continue
+                    retweeted = (legacy.get('retweeted_status_result') or {}).get('result')
+                    if retweeted:
+                        retweeted = _unwrap_tweet_result(retweeted)
+                        tweet_data = _legacy_tweet_data(retweeted['legacy'], _graphql_screen_name(retweeted), True)
                     else:
-                        logger.error(f"cookies 文件存在但無法載入，可能已過期或損壞，請重新運行 get_twitter_cookies.py")
-                    
-                    return []
+                        tweet_data = _legacy_tweet_data(legacy, _graphql_screen_name(result), False)
+                    response_tweets.append((tweet_data, has_social_context))
+            except Exception as e:
+                logger.warning(f"Error parsing UserTweets GraphQL response: {str(e)}")
+                continue
+            tweets.extend(response_tweets)
+            parsed_any = True
+        
+        # 所有回應都無法解析時（例如 API 格式變更），交由呼叫端改從 DOM 讀取，而不是當成沒有推文
+        return tweets if parsed_any else None
+    
+    def _get_user_tweets_selenium(self, username: str, start_time: datetime) -> Optional[List[Dict[str, Any]]]:
+        """Scrape a user's recent tweets with a headless browser.
+        
+        Used as a fallback when the syndication timeline is unavailable.
+        
+        Args:
+            username: Twitter username to fetch
+            start_time: Only tweets created after this time are returned
+            
+        Returns:
+            List of tweet dictionaries, or None if the timeline could not be
+            loaded (no login, login redirect, timeout or error), so the caller
+            does not cache the failure as an empty result
+        """
+        driver = None
+        try:
+            # 從瀏覽器池取得已使用 cookies 登入的瀏覽器
+            driver = self._acquire_driver()
+            if driver is None:
+                logger.warning("無法使用 cookies 登入 Twitter，請先運行 get_twitter_cookies.py 獲取有效的 cookies")
+                logger.warning("注意：get_twitter_cookies.py 會打開瀏覽器並需要您手動完成登入操作")
                 
-                user_tweets = []
+                # 檢查 cookies 文件是否存在
+                if not os.path.exists(self.cookie_file):
+                    logger.error(f"找不到 cookies 文件: {self.cookie_file}")
+                else:
+                    logger.error(f"cookies 文件存在但無法載入，可能已過期或損壞，請重新運行 get_twitter_cookies.py")
                 
-                # 訪問用戶頁面
-                url = f"https://twitter.com/{username}"
-                logger.info(f"Fetching tweets for {username} from {url}")
+                return None
+            
+            user_tweets = []
+            
+            # 訪問用戶頁面
+            url = f"https://twitter.com/{username}"
+            logger.info(f"Fetching tweets for {username} from {url}")
+            # 清除瀏覽器上次使用時留下的 performance log
+            driver.get_log("performance")
+            pending_requests = set()
+            
+            # 池中的瀏覽器只在建立時套用過 cookies；被導向登入頁代表 cookies 已過期，
+            # 重新讀取 cookies 文件並套用後再試一次。登入頁的跳轉由前端在頁面載入後才進行，
+            # 因此等到出現推文或網址變成登入頁之後才判斷
+            for attempt in range(2):
                 driver.get(url)
-                
-                # 等待頁面加載
                 try:
-                    WebDriverWait(driver, 15).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "article[data-testid='tweet']"))
-                    )
+                    WebDriverWait(driver, 15, poll_frequency=0.1).until(EC.any_of(
+                        EC.url_matches(LOGIN_URL_RE.pattern),
+                        EC.presence_of_element_located((By.CSS_SELECTOR, TWEET_SELECTOR))
+                    ))
                 except TimeoutException:
                     logger.warning(f"No tweets found for {username} or page not loaded properly")
-                    return []
+                    return None
+                
+                if not LOGIN_URL_RE.search(driver.current_url):
+                    break
+                if attempt or not self._reapply_cookies(driver):
+                    logger.warning(f"Still redirected to login page for {username}, discarding browser")
+                    self._discard_driver(driver)
+                    driver = None
+                    return None
+                driver.get_log("performance")
+            
+            # 使用增量滾動和批處理方式獲取推文
+            max_scrolls = 10  # 設置最大滾動次數
+            processed_ids = set()  # 用於追踪已處理的推文ID
+            # 最近處理到的原創推文時間；時間線由新到舊排列，早於 start_time 後便不需再滾動
+            # （轉推使用原推文的時間，置頂推文可能遠早於其他推文，因此都不作為判斷依據）
+            oldest_created_at = None
+            # 是否曾從 GraphQL 回應取得推文，以及最近一次 collect_tweets 是否讀到新的回應
+            used_graphql = False
+            got_graphql = False
+            
+            # 先處理當前可見的推文
+            article_count, last_article = driver.execute_script(LAST_TWEET_JS)
+            logger.info(f"Initially found {article_count} visible tweets for {username}")
+            
+            # 處理推文的函數，輸入為 EXTRACT_TWEETS_JS 在頁面內取得的原始資料
+            def process_tweets(raw_tweets):
+                nonlocal oldest_created_at
+                processed = []
+                # 逐則推文的記錄只在 DEBUG 等級輸出，避免每則推文都格式化整段內容
+                log_tweets = logger.isEnabledFor(logging.DEBUG)
+                for raw_tweet in raw_tweets:
+                    try:
+                        # 提取推文 ID
+                        tweet_url = raw_tweet['url']
+                        if not tweet_url:
+                            continue
+                        
+                        tweet_id_match = STATUS_ID_RE.search(tweet_url)
+                        if not tweet_id_match:
+                            continue
+                        
+                        tweet_id = tweet_id_match.group(1)
+                        
+                        # 如果已經處理過這個推文，則跳過
+                        if tweet_id in processed_ids:
+                            continue
+                        
+                        processed_ids.add(tweet_id)
+                        
+                        # 檢查是否為轉推（作者是否與查詢的用戶名匹配）
+                        is_retweet = False
+                        original_author = None
+                        if raw_tweet['author_url']:
+                            author_username = raw_tweet['author_url'].split("/")[-1].lower()
+                            if author_username != username.lower():
+                                if log_tweets:
+                                    logger.debug("檢測到轉推: 作者 @%s 不是 @%s", author_username, username)
+                                is_retweet = True
+                                original_author = author_username
+                        
+                        # 提取推文內容
+                        tweet_text = raw_tweet['text']
+                        
+                        # 記錄推文內容以進行調試
+                        if log_tweets:
+                            logger.debug("Tweet ID: %s, Content: %s", tweet_id, tweet_text)
+                        
+                        # 提取時間戳
+                        created_at = datetime.now(timezone.utc)
+                        timestamp = raw_tweet['datetime']
+                        if timestamp:
+                            # Python 3.11 起 fromisoformat 可直接解析 Z 結尾的 UTC 時間
+                            created_at = datetime.fromisoformat(timestamp if FROMISOFORMAT_PARSES_Z else timestamp.replace("Z", "+00:00"))
+                            if log_tweets:
+                                logger.debug("Tweet created at: %s", created_at)
+                        
+                        # 置頂推文可能遠早於其他推文，不作為停止滾動的依據
+                        if not is_retweet and not raw_tweet.get('has_social_context'):
+                            oldest_created_at = created_at
+                        
+                        # 如果推文早於指定時間，則跳過
+                        if created_at < start_time:
+                            continue
+                        
+                        # 提取推文中的圖片 URL
+                        image_urls = []
+                        for img_url in raw_tweet['image_urls']:
+                            if img_url and "https://pbs.twimg.com/media" in img_url:
+                                # 獲取高質量圖片 URL (移除尺寸限制參數)
+                                img_url = IMAGE_SIZE_RE.sub("&name=orig", img_url)
+                                image_urls.append(img_url)
+                                if log_tweets:
+                                    logger.debug("Found image: %s", img_url)
+                        
+                        # 構建推文數據
+                        tweet_data = {
+                            'id': tweet_id,
+                            'text': tweet_text,
+                            'created_at': created_at,
+                            'image_urls': image_urls,
+                            'url': tweet_url,
+                            'is_retweet': is_retweet
+                        }
+                        
+                        # 如果是轉推，添加原作者資訊
+                        if is_retweet and original_author:
+                            tweet_data['original_author'] = original_author
+                        processed.append(tweet_data)
+                    except Exception as e:
+                        logger.error(f"Error processing tweet for {username}: {str(e)}")
+                return processed
+            
+            # 優先使用頁面 GraphQL 回應中的結構化資料，沒有新回應時才解析 DOM
+            def collect_tweets():
+                nonlocal oldest_created_at, used_graphql, got_graphql
+                graphql_tweets = self._read_graphql_tweets(driver, pending_requests)
+                got_graphql = graphql_tweets is not None
+                used_graphql = used_graphql or got_graphql
+                if graphql_tweets is None:
+                    # 只取回尚未處理過的推文
+                    return process_tweets(driver.execute_script(EXTRACT_TWEETS_JS, list(processed_ids)))
                 
-                # 使用增量滾動和批處理方式獲取推文
-                max_scrolls = 10  # 設置最大滾動次數
-                processed_ids = set()  # 用於追踪已處理的推文ID
+                collected = []
+                for tweet_data, has_social_context in graphql_tweets:
+                    if tweet_data['id'] in processed_ids:
+                        continue
+                    processed_ids.add(tweet_data['id'])
+                    if not tweet_data['is_retweet'] and not has_social_context:
+                        oldest_created_at = tweet_data['created_at']
+                    if tweet_data['created_at'] >= start_time:
+                        collected.append(tweet_data)
+                return collected
+            
+            # 處理初始可見的推文
+            initial_tweets = collect_tweets()
+            user_tweets.extend(initial_tweets)
+            logger.info(f"Processed {len(initial_tweets)} initial tweets")
+            
+            # 推文列表是虛擬化的，數量不一定增加，以最後一則推文是否改變判斷是否載入新推文
+            def new_articles_loaded(d):
+                count, last = d.execute_script(LAST_TWEET_JS)
+                return (count, last) if last is not None and last != last_article else False
+            
+            # 逐步滾動並處理新出現的推文
+            scrolls_without_graphql = 0
+            for scroll_count in range(max_scrolls):
+                # 已經看到早於 start_time 的推文，之後只會更舊
+                if oldest_created_at is not None and oldest_created_at < start_time:
+                    logger.info(f"Reached tweets older than {start_time} for {username}, stop scrolling")
+                    break
                 
-                # 先處理當前可見的推文
-                tweet_elements = driver.find_elements(By.CSS_SELECTOR, "article[data-testid='tweet']")
-                logger.info(f"Initially found {len(tweet_elements)} visible tweets for {username}")
+                # 滾動頁面，但不是直接到底部，而是增量滾動
+                scroll_height = driver.execute_script("return window.innerHeight") * 0.8
+                driver.execute_script(f"window.scrollBy(0, {scroll_height});")
                 
-                # 處理推文的函數
-                def process_tweet_elements(elements):
-                    processed = []
-                    for tweet_element in elements:
-                        try:
-                            # 提取推文 ID
-                            tweet_links = tweet_element.find_elements(By.CSS_SELECTOR, "a[href*='/status/']")
-                            if not tweet_links:
-                                continue
-                            
-                            tweet_url = tweet_links[0].get_attribute("href")
-                            tweet_id_match = re.search(r"/status/(\d+)", tweet_url)
-                            if not tweet_id_match:
-                                continue
-                            
-                            tweet_id = tweet_id_match.group(1)
-                            
-                            # 如果已經處理過這個推文，則跳過
-                            if tweet_id in processed_ids:
-                                continue
-                            
-                            processed_ids.add(tweet_id)
-                            
-                            # 檢查是否為轉推
-                            is_retweet = False
-                            original_author = None
-                            try:
-                                # 尋找推文作者資訊
-                                author_elements = tweet_element.find_elements(By.CSS_SELECTOR, "div[data-testid='User-Name']")
-                                if author_elements:
-                                    # 提取用戶名（通常在第一個 span 中的第二個 a 標籤）
-                                    author_links = author_elements[0].find_elements(By.TAG_NAME, "a")
-                                    if len(author_links) >= 2:
-                                        author_href = author_links[1].get_attribute("href")
-                                        author_username = author_href.split("/")[-1].lower()
-                                        
-                                        # 檢查作者是否與查詢的用戶名匹配
-                                        if author_username != username.lower():
-                                            logger.info(f"檢測到轉推: 作者 @{author_username} 不是 @{username}")
-                                            is_retweet = True
-                                            original_author = author_username
-                            except Exception as e:
-                                logger.warning(f"檢查轉推狀態時出錯: {str(e)}")
-                            
-                            # 提取推文內容
-                            tweet_text_element = tweet_element.find_elements(By.CSS_SELECTOR, "div[data-testid='tweetText']")
-                            tweet_text = tweet_text_element[0].text if tweet_text_element else ""
-                            
-                            # 記錄推文內容以進行調試
-                            logger.info(f"Tweet ID: {tweet_id}, Content: {tweet_text}")
-                            
-                            # 提取時間戳（可能需要進一步處理）
-                            time_elements = tweet_element.find_elements(By.CSS_SELECTOR, "time")
-                            created_at = datetime.now(timezone.utc)
-                            if time_elements:
-                                timestamp = time_elements[0].get_attribute("datetime")
-                                if timestamp:
-                                    # 確保時間戳包含時區信息
-                                    created_at = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-                                    logger.info(f"Tweet created at: {created_at}")
-                            
-                            # 如果推文早於指定時間，則跳過
-                            if created_at < start_time:
-                                continue
-                            
-                            # 提取推文中的圖片 URL
-                            image_urls = []
-                            try:
-                                # 尋找圖片容器
-                                image_containers = tweet_element.find_elements(By.CSS_SELECTOR, "div[data-testid='tweetPhoto']")
-                                for container in image_containers:
-                                    # 尋找圖片元素
-                                    img_elements = container.find_elements(By.TAG_NAME, "img")
-                                    for img in img_elements:
-                                        img_url = img.get_attribute("src")
-                                        if img_url and "https://pbs.twimg.com/media" in img_url:
-                                            # 獲取高質量圖片 URL (移除尺寸限制參數)
-                                            img_url = re.sub(r"&name=\w+", "&name=orig", img_url)
-                                            image_urls.append(img_url)
-                                            logger.info(f"Found image: {img_url}")
-                            except Exception as e:
-                                logger.error(f"Error extracting images: {str(e)}")
-                            
-                            # 構建推文數據
-                            tweet_data = {
-                                'id': tweet_id,
-                                'text': tweet_text,
-                                'created_at': created_at,
-                                'image_urls': image_urls,
-                                'url': tweet_url,
-                                'is_retweet': is_retweet
-                            }
-                            
-                            # 如果是轉推，添加原作者資訊
-                            if is_retweet and original_author:
-                                tweet_data['original_author'] = original_author
-                            processed.append(tweet_data)
-                        except StaleElementReferenceException:
-                            logger.warning("Stale element reference when processing tweet, skipping")
-                            continue
-                        except Exception as e:
-                            logger.error(f"Error processing tweet for {username}: {str(e)}")
-                    return processed
+                # 等待新推文出現，而不是固定等待 2 秒
+                try:
+                    article_count, last_article = WebDriverWait(driver, 5, poll_frequency=0.1).until(new_articles_loaded)
+                except TimeoutException:
+                    logger.info(f"No more tweets loaded for {username} after scroll {scroll_count+1}")
+                    break
+                logger.info(f"Found {article_count} tweets after scroll {scroll_count+1}")
                 
-                # 處理初始可見的推文
-                initial_tweets = process_tweet_elements(tweet_elements)
-                user_tweets.extend(initial_tweets)
-                logger.info(f"Processed {len(initial_tweets)} initial tweets")
+                # 處理新出現的推文
+                seen_count = len(processed_ids)
+                new_tweets = collect_tweets()
+                user_tweets.extend(new_tweets)
+                logger.info(f"Processed {len(new_tweets)} new tweets after scroll {scroll_count+1}")
                 
-                # 逐步滾動並處理新出現的推文
-                for scroll_count in range(max_scrolls):
-                    # 滾動頁面，但不是直接到底部，而是增量滾動
-                    scroll_height = driver.execute_script("return window.innerHeight") * 0.8
-                    driver.execute_script(f"window.scrollBy(0, {scroll_height});")
-                    time.sleep(2)  # 等待頁面加載
-                    
-                    # 獲取當前可見的推文
-                    new_tweet_elements = driver.find_elements(By.CSS_SELECTOR, "article[data-testid='tweet']")
-                    logger.info(f"Found {len(new_tweet_elements)} tweets after scroll {scroll_count+1}")
-                    
-                    # 處理新出現的推文
-                    new_tweets = process_tweet_elements(new_tweet_elements)
-                    user_tweets.extend(new_tweets)
-                    logger.info(f"Processed {len(new_tweets)} new tweets after scroll {scroll_count+1}")
-                    
-                    # 如果沒有新推文，可以提前結束滾動
-                    if len(new_tweets) == 0:
+                if used_graphql:
+                    # GraphQL 一次載入整頁推文，之後幾次滾動只會顯示已處理過的推文，
+                    # 因此不以推文數量是否增加判斷，而是等待下一個 UserTweets 回應
+                    scrolls_without_graphql = 0 if got_graphql else scrolls_without_graphql + 1
+                    if scrolls_without_graphql >= MAX_SCROLLS_WITHOUT_GRAPHQL:
+                        logger.info(f"No new UserTweets response for {username} after {scrolls_without_graphql} scrolls")
                         break
-                
-                logger.info(f"Total tweets collected for {username}: {len(user_tweets)}")
-                return user_tweets
-            except TimeoutException:
-                logger.error(f"Timeout while fetching tweets for {username}")
-                return []
-            except Exception as e:
-                logger.error(f"Error fetching tweets for {username}: {str(e)}", exc_info=True)
-                return []
-            finally:
-                if driver:
-                    driver.quit()
+                # 如果沒有出現任何未處理過的推文，可以提前結束滾動
+                elif len(processed_ids) == seen_count:
+                    break
+            
+            logger.info(f"Total tweets collected for {username}: {len(user_tweets)}")
+            return user_tweets
+        except TimeoutException:
+            logger.error(f"Timeout while fetching tweets for {username}")
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching tweets for {username}: {str(e)}", exc_info=True)
+            # 發生未預期的錯誤時丟棄這個瀏覽器，避免重用狀態異常的實例
+            if driver:
+                self._discard_driver(driver)
+                driver = None
+            return None
+        finally:
+            if driver:
+                self._driver_pool.put(driver)
+    
+    async def get_recent_tweets(self, hours: int = 24) -> Dict[str, List[Dict[str, Any]]]:
+        current_time = datetime.now(timezone.utc)
         
-        #處理每個用戶
+        # 只重新抓取緩存已過期的用戶
+        tweets_by_user = {}
+        to_fetch = []
         for username in self.config.twitter_users:
-            logger.info(f"Fetching tweets for {username}")
+            cache_key = (username.lower(), hours)
+            expiry, columns = self._tweets_cache.get(cache_key, (None, None))
+            if expiry is not None and current_time < expiry:
+                logger.info(f"Using cached tweets for {username} ({hours} hours)")
+                self._tweets_cache.move_to_end(cache_key)
+                tweets_by_user[cache_key[0]] = _from_columns(columns)
+            else:
+                to_fetch.append(username)
+        
+        if not to_fetch:
+            return tweets_by_user
+        
+        # Calculate the start time for tweet retrieval
+        start_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+        logger.info(f"start time: {start_time}")
+        
+        # 在協程內取得正在運行的事件循環，只需取得一次
+        loop = asyncio.get_running_loop()
+        
+        # 限制同時透過 HTTP 抓取的用戶數量；瀏覽器數量由執行緒池大小限制
+        semaphore = asyncio.Semaphore(self.max_workers)
+        # 本次抓取需要寫入 SQLite 的緩存項目，全部完成後在執行緒中一次寫入
+        db_rows = []
+        
+        async def _fetch(username):
+            cache_key = (username.lower(), hours)
+            async with semaphore:
+                timeline = await self._fetch_syndication_timeline(username)
+            partial_tweets = []
+            if timeline is not None:
+                tweets, reaches_start = self._parse_syndication_timeline(username, timeline, start_time)
+                if reaches_start:
+                    db_rows.append(self._store_cached_tweets(cache_key, tweets, current_time))
+                    return tweets
+                # syndication 時間線沒有涵蓋到 start_time，較早的推文可能缺漏
+                logger.info(f"Syndication timeline for {username} does not reach {start_time}")
+                partial_tweets = tweets
             
-            # 使用 run_in_executor 執行阻塞操作
-            loop = asyncio.get_event_loop()
-            tweets = await loop.run_in_executor(
-                self.executor, 
-                _get_user_tweets, 
-                username
-            )
+            # 無法透過 HTTP 取得完整時間線時改用瀏覽器抓取
+            logger.info(f"Falling back to Selenium for {username}")
+            tweets = await loop.run_in_executor(self.executor, self._get_user_tweets_selenium, username, start_time)
+            if tweets is None:
+                # 瀏覽器也失敗時返回 syndication 取得的部分推文，但不寫入緩存，下次呼叫會重新抓取
+                logger.warning(f"Could not fetch the full timeline for {username}, result is not cached")
+                return partial_tweets
+            db_rows.append(self._store_cached_tweets(cache_key, tweets, current_time))
+            return tweets
+        
+        # 同一個用戶已在抓取中時直接等待該任務
+        pending = {}
+        for username in to_fetch:
+            cache_key = (username.lower(), hours)
+            task = self._tweets_cache_inflight.get(cache_key)
+            if task is None:
+                task = asyncio.ensure_future(_fetch(username))
+                self._tweets_cache_inflight[cache_key] = task
+                task.add_done_callback(lambda _, key=cache_key: self._tweets_cache_inflight.pop(key, None))
+            pending[cache_key[0]] = task
+        
+        # 同時抓取所有需要更新的用戶的推文；shield 讓其中一個呼叫被取消時不影響共用的任務
+        # 單一用戶抓取失敗時只記錄錯誤並返回空列表（不寫入緩存），不影響其他用戶
+        results = await asyncio.gather(*(asyncio.shield(task) for task in pending.values()), return_exceptions=True)
+        for user, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                logger.error(f"Error fetching tweets for {user}: {str(result)}", exc_info=result)
+                result = []
+            tweets_by_user[user] = result
+        
+        # 在執行緒中寫入 SQLite 並只 commit 一次，避免磁碟同步阻塞事件循環
+        if db_rows and self._db is not None:
+            await asyncio.to_thread(self._persist_cached_tweets, db_rows)
+        
+        # 依照設定中的用戶順序返回
+        return {username.lower(): tweets_by_user[username.lower()] for username in self.config.twitter_users}
+    
+    def _store_cached_tweets(self, cache_key: Tuple[str, int], tweets: List[Dict[str, Any]],
+                             fetched_at: datetime) -> Tuple[str, int, float, float, Dict[str, tuple]]:
+        """Cache one user's tweets, evicting the least recently used entries past max_cache_entries.
+        
+        Each entry's TTL is jittered by ±10% so entries fetched together do
+        not all expire at the same moment.
+        
+        Returns:
+            The row to pass to _persist_cached_tweets so the entry survives restarts
+        """
+        columns = _to_columns(tweets)
+        expiry = fetched_at + timedelta(minutes=self.cache_ttl_minutes * random.uniform(0.9, 1.1))
+        self._tweets_cache[cache_key] = (expiry, columns)
+        self._tweets_cache.move_to_end(cache_key)
+        while len(self._tweets_cache) > self.max_cache_entries:
+            self._tweets_cache.popitem(last=False)
+        return (cache_key[0], cache_key[1], fetched_at.timestamp(), expiry.timestamp(), columns)
+    
+    def _persist_cached_tweets(self, rows: List[Tuple[str, int, float, float, Dict[str, tuple]]]):
+        """Write cache entries to SQLite in one transaction; runs in a worker thread."""
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO tweets_cache(user, hours, fetched_at, expires_at, payload) VALUES (?, ?, ?, ?, ?)",
+                    [(user, hours, fetched_at, expires_at, orjson.dumps(columns))
+                     for user, hours, fetched_at, expires_at, columns in rows]
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"寫入推文緩存資料庫時出錯: {str(e)}")
+    
+    async def _fetch_syndication_timeline(self, username: str) -> Optional[List[Dict[str, Any]]]:
+        """Download a user's public syndication timeline.
+        
+        Args:
+            username: Twitter username to fetch
             
-            tweets_by_user[username.lower()] = tweets
+        Returns:
+            The raw tweet objects in timeline order, or None if the timeline
+            could not be fetched or holds no tweets and the caller should
+            fall back to Selenium
+        """
+        url = SYNDICATION_TIMELINE_URL.format(username=username)
+        try:
+            async with self._get_session().get(url, headers={'User-Agent': USER_AGENT}, timeout=SYNDICATION_TIMEOUT) as response:
+                if response.status != 200:
+                    logger.warning(f"Syndication timeline for {username} returned HTTP {response.status}")
+                    return None
+                html = await response.text()
             
-            # 添加短暫延遲以避免過度請求
-            await asyncio.sleep(1)
+            match = NEXT_DATA_RE.search(html)
+            if not match:
+                logger.warning(f"No timeline data found in syndication page for {username}")
+                return None
+            entries = orjson.loads(match.group(1))['props']['pageProps']['timeline']['entries']
+        except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError, KeyError, TypeError) as e:
+            logger.warning(f"Error fetching syndication timeline for {username}: {str(e)}")
+            return None
         
-        # 更新緩存
-        self._tweets_cache[cache_key] = tweets_by_user
-        self._tweets_cache_time[cache_key] = current_time
+        timeline = [tweet for tweet in ((entry.get('content') or {}).get('tweet') for entry in entries) if tweet]
+        # 空的時間線多半是頁面被限制，而不是用戶真的沒有推文，不應當作結果緩存
+        if not timeline:
+            logger.warning(f"Syndication timeline for {username} holds no tweets")
+            return None
+        return timeline
+    
+    def _parse_syndication_timeline(self, username: str, timeline: List[Dict[str, Any]],
+                                    start_time: datetime) -> Tuple[List[Dict[str, Any]], bool]:
+        """Convert syndication tweet objects into tweet dictionaries.
         
-        return tweets_by_user
+        Args:
+            username: Twitter username the timeline belongs to
+            timeline: Tweet objects returned by _fetch_syndication_timeline
+            start_time: Only tweets created after this time are returned
+            
+        Returns:
+            The list of tweet dictionaries, and whether the timeline reaches
+            back to start_time; if it does not, tweets in the window may be missing
+        """
+        user_tweets = []
+        reaches_start = False
+        for tweet in timeline:
+            try:
+                # syndication 只回傳最近的一小段時間線；以發文（或轉推）的時間判斷是否涵蓋到 start_time
+                if datetime.strptime(tweet['created_at'], TWITTER_DATE_FORMAT) < start_time:
+                    reaches_start = True
+                # 轉推的內容、時間與連結都以原推文為準，與 Selenium 抓取的結果一致
+                retweeted = tweet.get('retweeted_status')
+                source = retweeted or tweet
+                tweet_data = _legacy_tweet_data(source, source['user']['screen_name'], retweeted is not None)
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Skipping malformed syndication tweet for {username}: {str(e)}")
+                continue
+            if tweet_data['created_at'] < start_time:
+                continue
+            user_tweets.append(tweet_data)
+        
+        logger.info(f"Total tweets collected for {username} via syndication: {len(user_tweets)}")
+        return user_tweets, reaches_start
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the HTTP session, creating one on first use if none was provided."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=SYNDICATION_TIMEOUT)
+            self._owns_session = True
+        return self._session
+    
+    async def aclose(self):
+        """Close the HTTP session if this client created it and quit pooled browsers."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+        with self._drivers_lock:
+            drivers = list(self._drivers)
+            self._drivers.clear()
+            self._driver_pool = queue.Queue()
+        await asyncio.to_thread(_quit_drivers, drivers)
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
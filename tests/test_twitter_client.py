@@ -0,0 +1,320 @@
+"""
+Tests for the Selenium fallback in modules.twitter_client.
+The browser is replaced by a small fake WebDriver, so no Chrome is needed.
+"""
+
+import asyncio
+import os
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import orjson
+from selenium.common.exceptions import NoSuchElementException
+
+from modules.config import Config
+from modules.twitter_client import MAX_SCROLLS_WITHOUT_GRAPHQL, TWITTER_DATE_FORMAT, TwitterClient
+
+def _now_iso(offset: timedelta = timedelta()) -> str:
+    """Return a <time datetime> style timestamp relative to now."""
+    return (datetime.now(timezone.utc) + offset).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+def _raw_tweet(username: str, tweet_id: str, text: str, timestamp: str, has_social_context: bool = False) -> dict:
+    """Build one item as returned by EXTRACT_TWEETS_JS."""
+    return {
+        'url': f"https://x.com/{username}/status/{tweet_id}",
+        'author_url': f"https://x.com/{username}",
+        'text': text,
+        'datetime': timestamp,
+        'image_urls': [],
+        'has_social_context': has_social_context
+    }
+
+def _graphql_body(tweet_id: str, text: str, offset: timedelta, pinned: bool = False) -> str:
+    """Build a UserTweets GraphQL response holding one tweet by @foo."""
+    item_content = {'tweet_results': {'result': {
+        'core': {'user_results': {'result': {'legacy': {'screen_name': 'foo'}}}},
+        'legacy': {
+            'id_str': tweet_id,
+            'full_text': text,
+            'created_at': (datetime.now(timezone.utc) + offset).strftime(TWITTER_DATE_FORMAT)
+        }
+    }}}
+    if pinned:
+        item_content['socialContext'] = {'type': 'TimelineGeneralContext', 'contextType': 'Pin'}
+        instruction = {'type': 'TimelinePinEntry', 'entry': {'content': {'itemContent': item_content}}}
+    else:
+        instruction = {'type': 'TimelineAddEntries', 'entries': [{'content': {'itemContent': item_content}}]}
+    payload = {'data': {'user': {'result': {'timeline_v2': {'timeline': {'instructions': [instruction]}}}}}}
+    return orjson.dumps(payload).decode()
+
+def _syndication_tweet(tweet_id: str, text: str, offset: timedelta) -> dict:
+    """Build one tweet object as found in the syndication timeline of @foo."""
+    return {
+        'id_str': tweet_id,
+        'full_text': text,
+        'created_at': (datetime.now(timezone.utc) + offset).strftime(TWITTER_DATE_FORMAT),
+        'user': {'screen_name': 'foo'}
+    }
+
+def _performance_log(request_id: str) -> list:
+    """Build performance log entries for one finished UserTweets request."""
+    events = [
+        {'method': 'Network.responseReceived', 'params': {
+            'requestId': request_id,
+            'response': {'url': "https://x.com/i/api/graphql/abc123/UserTweets?variables=%7B%7D"}
+        }},
+        {'method': 'Network.loadingFinished', 'params': {'requestId': request_id}},
+    ]
+    return [{'message': orjson.dumps({'message': event}).decode()} for event in events]
+
+class FakeDriver:
+    """Just enough of a WebDriver for _get_user_tweets_selenium."""
+    
+    LOGIN_URL = "https://x.com/i/flow/login?redirect_after_login=%2Ffoo"
+    
+    def __init__(self, raw_tweets, performance_log=None, graphql_bodies=("not json",), visible=None,
+                 login_redirects=0, performance_logs=None):
+        self.raw_tweets = raw_tweets
+        self.performance_log = list(performance_log or [])
+        # 若有指定，依序作為每次 get_log 的結果，用完後不再有新的請求
+        self.performance_logs = None if performance_logs is None else list(performance_logs)
+        self.scrolls = 0
+        # 依序回傳的 GraphQL 回應內容，用完後重複回傳最後一個
+        self.graphql_bodies = list(graphql_bodies)
+        # 目前頁面上可見的推文數量，每次滾動多顯示一則
+        self.visible = len(raw_tweets) if visible is None else visible
+        self.current_url = "about:blank"
+        self.visited = []
+        # 前幾次開啟頁面時，在頁面載入後才由前端跳轉到登入頁
+        self.login_redirects = login_redirects
+        self.redirect_pending = False
+    
+    def get(self, url):
+        self.visited.append(url)
+        self.current_url = url
+        self.redirect_pending = self.login_redirects > 0
+        self.login_redirects -= 1
+    
+    def get_log(self, log_type):
+        if self.performance_logs is not None:
+            return self.performance_logs.pop(0) if self.performance_logs else []
+        # 每次讀取都回報同一個 UserTweets 請求剛完成，模擬每次滾動都載入新回應
+        return list(self.performance_log)
+    
+    def find_element(self, by, selector):
+        if self.redirect_pending:
+            self.redirect_pending = False
+            self.current_url = self.LOGIN_URL
+        if self.current_url == self.LOGIN_URL:
+            raise NoSuchElementException(selector)
+        return object()
+    
+    def find_elements(self, by, selector):
+        return [object()]
+    
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Network.getResponseBody":
+            body = self.graphql_bodies[0]
+            if len(self.graphql_bodies) > 1:
+                self.graphql_bodies.pop(0)
+            return {'body': body}
+        return {}
+    
+    def execute_script(self, script, *args):
+        if "innerHeight" in script:
+            return 800
+        if "scrollBy" in script:
+            self.scrolls += 1
+            self.visible += 1
+            return None
+        if "document.readyState" in script:
+            return "complete"
+        if "articles.length" in script:
+            # 每次都回傳新的最後一則推文元素，讓滾動等待立即結束
+            return [len(self.raw_tweets), object()]
+        # EXTRACT_TWEETS_JS：略過 arguments[0] 中已處理過的推文
+        seen = set(args[0]) if args else set()
+        return [tweet for tweet in self.raw_tweets[:self.visible] if tweet['url'].rsplit("/", 1)[-1] not in seen]
+
+class TwitterClientTestCase(unittest.TestCase):
+    """Creates a TwitterClient for @foo without a cache database or cookie files."""
+    
+    def setUp(self):
+        # _load_cookies 會遷移或刪除專案目錄中的 cookies 文件，測試期間不可碰觸開發者的真實檔案
+        load_cookies = mock.patch.object(TwitterClient, '_load_cookies', return_value=[])
+        load_cookies.start()
+        self.addCleanup(load_cookies.stop)
+        with mock.patch.dict(os.environ, {'TWITTER_USERS': 'foo'}):
+            self.client = TwitterClient(Config(), cache_db_path=None)
+        self.addCleanup(self.client.executor.shutdown, wait=False)
+        self.start_time = datetime.now(timezone.utc) - timedelta(hours=24)
+
+class SeleniumFallbackTest(TwitterClientTestCase):
+    
+    def fetch(self, driver):
+        self.client._acquire_driver = lambda: driver
+        return self.client._get_user_tweets_selenium('foo', self.start_time)
+    
+    def test_unparseable_graphql_response_falls_back_to_dom(self):
+        driver = FakeDriver(
+            [_raw_tweet('foo', '2', 'recent tweet', _now_iso(-timedelta(hours=1)))],
+            performance_log=_performance_log('1'),
+        )
+        
+        tweets = self.fetch(driver)
+        
+        self.assertEqual([tweet['id'] for tweet in tweets], ['2'])
+        self.assertEqual(tweets[0]['text'], 'recent tweet')
+    
+    def test_read_graphql_tweets_returns_none_when_no_response_parses(self):
+        driver = FakeDriver([], performance_log=_performance_log('1'))
+        
+        self.assertIsNone(self.client._read_graphql_tweets(driver, set()))
+    
+    def test_old_pinned_tweet_does_not_stop_scrolling(self):
+        driver = FakeDriver(
+            [
+                _raw_tweet('foo', '1', 'old pinned tweet', _now_iso(-timedelta(days=30)), has_social_context=True),
+                _raw_tweet('foo', '2', 'recent tweet', _now_iso(-timedelta(hours=1))),
+            ],
+            visible=1,
+        )
+        
+        tweets = self.fetch(driver)
+        
+        self.assertEqual([tweet['id'] for tweet in tweets], ['2'])
+    
+    def test_old_pinned_graphql_tweet_does_not_stop_scrolling(self):
+        driver = FakeDriver(
+            [],
+            performance_log=_performance_log('1'),
+            graphql_bodies=[
+                _graphql_body('1', 'old pinned tweet', -timedelta(days=30), pinned=True),
+                _graphql_body('2', 'recent tweet', -timedelta(hours=1)),
+            ],
+        )
+        
+        tweets = self.fetch(driver)
+        
+        self.assertEqual([tweet['id'] for tweet in tweets], ['2'])
+    
+    def test_graphql_scrolling_continues_until_the_next_response(self):
+        # get_log 的呼叫順序：開啟頁面前清除、初始頁面、之後每次滾動各一次
+        driver = FakeDriver(
+            [],
+            graphql_bodies=[
+                _graphql_body('1', 'first page tweet', -timedelta(hours=1)),
+                _graphql_body('2', 'second page tweet', -timedelta(hours=2)),
+            ],
+            performance_logs=[[], _performance_log('1'), [], [], _performance_log('2')],
+        )
+        
+        tweets = self.fetch(driver)
+        
+        self.assertEqual([tweet['id'] for tweet in tweets], ['1', '2'])
+        self.assertEqual(driver.scrolls, 3 + MAX_SCROLLS_WITHOUT_GRAPHQL)
+    
+    def test_old_original_tweet_stops_scrolling(self):
+        driver = FakeDriver(
+            [
+                _raw_tweet('foo', '1', 'old tweet', _now_iso(-timedelta(days=30))),
+                _raw_tweet('foo', '2', 'never reached', _now_iso(-timedelta(hours=1))),
+            ],
+            visible=1,
+        )
+        
+        self.assertEqual(self.fetch(driver), [])
+
+class LoginRedirectTest(TwitterClientTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.applied = []
+        self.discarded = []
+        self.client._discard_driver = self.discarded.append
+    
+    def fetch(self, driver, login_succeeds=True):
+        self.client._acquire_driver = lambda: driver
+        self.client._apply_cookies = lambda d: self.applied.append(d) or login_succeeds
+        return self.client._get_user_tweets_selenium('foo', self.start_time)
+    
+    def test_late_login_redirect_reapplies_cookies_and_retries(self):
+        driver = FakeDriver([_raw_tweet('foo', '2', 'recent tweet', _now_iso(-timedelta(hours=1)))], login_redirects=1)
+        
+        tweets = self.fetch(driver)
+        
+        self.assertEqual(self.applied, [driver])
+        self.assertEqual(driver.visited, ["https://twitter.com/foo", "https://twitter.com/foo"])
+        self.assertEqual([tweet['id'] for tweet in tweets], ['2'])
+        self.assertEqual(self.discarded, [])
+    
+    def test_browser_is_discarded_when_login_keeps_failing(self):
+        driver = FakeDriver([_raw_tweet('foo', '2', 'recent tweet', _now_iso(-timedelta(hours=1)))], login_redirects=2)
+        
+        self.assertIsNone(self.fetch(driver))
+        self.assertEqual(self.applied, [driver])
+        self.assertEqual(self.discarded, [driver])
+    
+    def test_username_starting_with_login_is_not_a_redirect(self):
+        driver = FakeDriver([_raw_tweet('login_fan', '2', 'recent tweet', _now_iso(-timedelta(hours=1)))])
+        self.client._acquire_driver = lambda: driver
+        self.client._apply_cookies = lambda d: self.applied.append(d) or True
+        
+        tweets = self.client._get_user_tweets_selenium('login_fan', self.start_time)
+        
+        self.assertEqual(self.applied, [])
+        self.assertEqual([tweet['id'] for tweet in tweets], ['2'])
+
+class GetRecentTweetsTest(TwitterClientTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.selenium_calls = []
+        self.selenium_result = []
+    
+    def fetch(self, timeline):
+        async def fetch_timeline(username):
+            return timeline
+        
+        def get_user_tweets_selenium(username, start_time):
+            self.selenium_calls.append(username)
+            return self.selenium_result
+        
+        self.client._fetch_syndication_timeline = fetch_timeline
+        self.client._get_user_tweets_selenium = get_user_tweets_selenium
+        return asyncio.run(self.client.get_recent_tweets(24))['foo']
+    
+    def test_timeline_reaching_start_time_skips_selenium(self):
+        tweets = self.fetch([
+            _syndication_tweet('2', 'recent tweet', -timedelta(hours=1)),
+            _syndication_tweet('1', 'old tweet', -timedelta(days=2)),
+        ])
+        
+        self.assertEqual([tweet['id'] for tweet in tweets], ['2'])
+        self.assertEqual(self.selenium_calls, [])
+        self.assertIn(('foo', 24), self.client._tweets_cache)
+    
+    def test_short_timeline_falls_back_to_selenium(self):
+        self.selenium_result = [{'id': '3', 'text': 'from browser', 'created_at': datetime.now(timezone.utc),
+                                 'image_urls': [], 'url': "https://x.com/foo/status/3", 'is_retweet': False}]
+        
+        tweets = self.fetch([_syndication_tweet('2', 'recent tweet', -timedelta(hours=1))])
+        
+        self.assertEqual(self.selenium_calls, ['foo'])
+        self.assertEqual([tweet['id'] for tweet in tweets], ['3'])
+    
+    def test_selenium_failure_is_not_cached(self):
+        self.selenium_result = None
+        
+        tweets = self.fetch([_syndication_tweet('2', 'recent tweet', -timedelta(hours=1))])
+        
+        self.assertEqual([tweet['id'] for tweet in tweets], ['2'])
+        self.assertNotIn(('foo', 24), self.client._tweets_cache)
+        
+        self.assertEqual(self.fetch(None), [])
+        self.assertEqual(self.selenium_calls, ['foo', 'foo'])
+        self.assertNotIn(('foo', 24), self.client._tweets_cache)
+
+if __name__ == "__main__":
+    unittest.main()